@@ -4,6 +4,14 @@ from mplleaflet._display import (
     show,
     display,
     save_html,
+    save_geojson,
+    save_tiles,
     fig_to_html,
     fig_to_geojson,
 )
+from mplleaflet.geo import geo_to_html, save_geo_html, to_geojson
+from mplleaflet.layers import layers_to_html, save_layers_html
+from mplleaflet._batch import save_html_batch
+from mplleaflet.profiling import Profile
+from mplleaflet.session import MapSession
+from mplleaflet.server import MapServer, serve
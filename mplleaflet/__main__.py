@@ -0,0 +1,5 @@
+import sys
+
+from mplleaflet.cli import main
+
+sys.exit(main())
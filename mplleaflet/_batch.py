@@ -0,0 +1,176 @@
+from __future__ import absolute_import
+
+import collections
+import contextlib
+import os
+import sys
+import timeit
+import traceback
+
+from ._display import save_html
+
+BatchResult = collections.namedtuple('BatchResult',
+                                     ['index', 'path', 'error', 'seconds'])
+BatchResult.__doc__ = """
+Outcome of converting one figure with save_html_batch()
+
+index is the position of the figure in the input, error is None on success
+or the formatted traceback, and seconds is the wall time of the conversion.
+"""
+
+
+# Whether a job of run_jobs() is running in this process. show() doesn't
+# open a browser then.
+_in_job = False
+
+
+def _init_worker():
+    # Workers never display anything. pyplot isn't imported here unless a
+    # forked worker inherited it, possibly with an interactive backend.
+    os.environ['MPLBACKEND'] = 'Agg'
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].switch_backend('Agg')
+
+
+def _run_job(job):
+    index, path, func, args = job
+    start = timeit.default_timer()
+    error = None
+    with _job_pyplot():
+        try:
+            func(*args)
+        except Exception:
+            error = traceback.format_exc()
+    return BatchResult(index, path, error, timeit.default_timer() - start)
+
+
+@contextlib.contextmanager
+def _job_pyplot():
+    """
+    Keep a job from displaying figures or leaving them open
+
+    Jobs run in this process when run_jobs() is given processes=1. If the
+    job imports pyplot, it gets the Agg backend. pyplot's backend isn't
+    switched if it was already imported, as that would close the caller's
+    figures, but its show() does nothing during the job. The figures the
+    job creates are closed when it's done.
+
+    """
+    global _in_job
+    plt = sys.modules.get('matplotlib.pyplot')
+    backend = os.environ.get('MPLBACKEND')
+    if plt is None:
+        os.environ['MPLBACKEND'] = 'Agg'
+        before = set()
+    else:
+        before = set(plt.get_fignums())
+        show = plt.show
+        plt.show = lambda *args, **kwargs: None
+    _in_job = True
+    try:
+        yield
+    finally:
+        _in_job = False
+        if plt is not None:
+            plt.show = show
+        if plt is None:
+            if backend is None:
+                os.environ.pop('MPLBACKEND', None)
+            else:
+                os.environ['MPLBACKEND'] = backend
+        # Figures are pyplot globals: don't let them pile up
+        plt = sys.modules.get('matplotlib.pyplot')
+        if plt is not None:
+            for num in plt.get_fignums():
+                if num not in before:
+                    plt.close(num)
+
+
+def run_jobs(jobs, processes=None, callback=None):
+    """
+    Run conversion jobs in a pool of worker processes
+
+    Parameters
+    ----------
+    jobs : iterable
+        (path, func, args) tuples. Each job calls func(*args), which should
+        write its output to path. func and args must be picklable.
+    processes : int, default None
+        Number of worker processes, the number of CPUs by default. With 1,
+        the jobs are run one after another in this process.
+    callback : callable, default None
+        Called with each BatchResult as soon as its job is done
+
+    Returns
+    -------
+    List of BatchResult, in the order of the jobs
+
+    """
+    jobs = ((i, path, func, args)
+            for i, (path, func, args) in enumerate(jobs))
+
+    results = []
+    if processes == 1:
+        outcomes = (_run_job(job) for job in jobs)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, initializer=_init_worker)
+        outcomes = pool.imap_unordered(_run_job, jobs)
+
+    try:
+        for result in outcomes:
+            results.append(result)
+            if callback is not None:
+                callback(result)
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+        raise
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return sorted(results, key=lambda r: r.index)
+
+
+def _save_figure(fig, path, kwargs):
+    if callable(fig):
+        fig = fig()
+    save_html(fig, fileobj=path, **kwargs)
+
+
+def save_html_batch(figures, paths, processes=None, callback=None, **kwargs):
+    """
+    Convert many Matplotlib Figures to Leaflet maps in parallel
+
+    Each figure is converted with save_html() in a pool of worker processes
+    using the Agg backend. Errors are reported per figure instead of
+    stopping the batch.
+
+    Parameters
+    ----------
+    figures : iterable
+        Figures, or picklable callables taking no arguments and returning a
+        figure. Callables are called in the worker, which avoids pickling
+        the figures and keeps the parent's pyplot state untouched.
+    paths : iterable of strings
+        Output html file for each figure
+    processes : int, default None
+        Number of worker processes, the number of CPUs by default. With 1,
+        the figures are converted one after another in this process.
+    callback : callable, default None
+        Called with each BatchResult as soon as its figure is done, e.g. to
+        report progress.
+
+    See fig_to_html() for description of the other keyword args.
+
+    Returns
+    -------
+    List of BatchResult, in the order of the input figures
+
+    """
+    jobs = ((path, _save_figure, (fig, path, kwargs))
+            for fig, path in zip(figures, paths))
+    return run_jobs(jobs, processes=processes, callback=callback)
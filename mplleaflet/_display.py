@@ -7,25 +7,66 @@ import base64
 
 import six
 
-import matplotlib.pyplot as plt
-from .mplexporter.exporter import Exporter
-from jinja2 import Environment, PackageLoader
-
-from .leaflet_renderer import LeafletRenderer
 from .links import JavascriptLink, CssLink
-from .utils import FloatEncoder
+from .profiling import get_profile
 from . import maptiles
 
-# We download explicitly the CSS and the JS.
-_leaflet_js = JavascriptLink('https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.3/leaflet.js')
-_leaflet_css = CssLink('https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.3/leaflet.css')
+# We download explicitly the CSS and the JS. A copy of both ships with the
+# package so they can be embedded offline.
+_static = os.path.join(os.path.dirname(__file__), 'static')
+_leaflet_js = JavascriptLink(
+    'https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.3/leaflet.js',
+    path=os.path.join(_static, 'leaflet.js'),
+    sha256='fa898196b800b919d479948413ebd80442c6e1ddb61ed4a9af31cf02e33d7746')
+_leaflet_css = CssLink(
+    'https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.3/leaflet.css',
+    path=os.path.join(_static, 'leaflet.css'),
+    sha256='929a5f8632dc17711dde485c1da1c79559ccf12cc34cece9c78be44a70d4531d')
 _attribution = '<a href="https://github.com/jwass/mplleaflet">mplleaflet</a>'
 
-env = Environment(loader=PackageLoader('mplleaflet', 'templates'),
-                  trim_blocks=True, lstrip_blocks=True)
+_env = None
+_templates = {}
+
+def get_env():
+    """
+    Return the Jinja2 Environment loading the package's templates
+
+    It is created on first use, so that importing mplleaflet doesn't import
+    jinja2. The templates ship with the package, so they aren't checked for
+    changes once loaded. If $MPLLEAFLET_TEMPLATE_CACHE is set, the compiled
+    templates are also cached in that directory, so that new processes
+    don't compile them again.
+
+    """
+    global _env
+    if _env is None:
+        from jinja2 import Environment, PackageLoader
+        _env = Environment(loader=PackageLoader('mplleaflet', 'templates'),
+                           trim_blocks=True, lstrip_blocks=True,
+                           auto_reload=False, cache_size=-1,
+                           bytecode_cache=_bytecode_cache())
+    return _env
+
+def _bytecode_cache():
+    directory = os.environ.get('MPLLEAFLET_TEMPLATE_CACHE')
+    if not directory:
+        return None
+    from jinja2 import FileSystemBytecodeCache
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    return FileSystemBytecodeCache(directory)
+
+def get_template(name):
+    """ Return a compiled template of the package, loading it once """
+    template = _templates.get(name)
+    if template is None:
+        template = _templates[name] = get_env().get_template(name)
+    return template
 
 def fig_to_html(fig=None, template='base.html', tiles=None, crs=None,
-                epsg=None, embed_links=False, float_precision=6):
+                epsg=None, embed_links=False, float_precision=6,
+                simplify=None, canvas=None, canvas_threshold=2000,
+                encoding='json', cull=False, cache=None, profile=None):
     """
     Convert a Matplotlib Figure to a Leaflet map
 
@@ -59,6 +100,39 @@ def fig_to_html(fig=None, template='base.html', tiles=None, crs=None,
         the final html.
     float_precision : int, default 6
         The precision to be used for the floats in the embedded geojson.
+    simplify : float, default None
+        Tolerance, in degrees, used to simplify lines and polygons with the
+        Douglas-Peucker algorithm. By default every vertex is kept.
+    canvas : bool, default None
+        Whether to draw the features on a canvas instead of as DOM elements.
+        Markers are then drawn as circles of the same size and color. If
+        None, the canvas is used when the map has more than
+        canvas_threshold layers, counting each marker.
+    canvas_threshold : int, default 2000
+        Number of layers above which canvas=None selects the canvas.
+    encoding : string, default 'json'
+        How coordinates are written in the page. 'json' writes decimal
+        numbers. 'delta' writes each array of positions as base64 encoded
+        int32 deltas, quantized at float_precision, which the page decodes
+        when it loads. This is several times smaller for dense figures.
+        Raises ValueError if the positions don't fit in int32, which can
+        happen with float_precision above 6, see
+        utils.delta_encode_positions().
+    cull : bool, default False
+        Whether to only add the features in view to the map. The features
+        are indexed on a grid of their bounding boxes, which is written in
+        the page, and the visible ones are updated as the map moves.
+    cache : RenderCache or bool, default None
+        If given, the html is looked up in this mplleaflet.cache.RenderCache,
+        keyed on the figure's content and the other arguments, and stored
+        there after rendering. True uses a default in-memory cache. The map
+        id is then derived from the key, so the same figure always gives the
+        same html.
+    profile : Profile or callable, default None
+        If given, the wall time, features, vertices and bytes of each stage
+        of the export, and of each artist, are recorded in this
+        mplleaflet.Profile. A callable is called with Profile.to_dict() when
+        the export is done.
 
     Note: only one of 'crs' or 'epsg' may be specified. Both may be None, in
     which case the plot is assumed to be longitude / latitude.
@@ -68,6 +142,17 @@ def fig_to_html(fig=None, template='base.html', tiles=None, crs=None,
     String of html of the resulting webpage
 
     """
+    return ''.join(_iter_html(fig, template=template, tiles=tiles, crs=crs,
+                              epsg=epsg, embed_links=embed_links,
+                              float_precision=float_precision,
+                              simplify=simplify, canvas=canvas,
+                              canvas_threshold=canvas_threshold,
+                              encoding=encoding, cull=cull, cache=cache,
+                              profile=profile))
+
+
+def _get_tiles(tiles):
+    """ Resolve the tiles argument of fig_to_html() to a (url, attribution) """
     if tiles is None:
         tiles = maptiles.osm
     elif isinstance(tiles, six.string_types):
@@ -75,69 +160,400 @@ def fig_to_html(fig=None, template='base.html', tiles=None, crs=None,
             raise ValueError('Unknown tile source "{}"'.format(tiles))
         else:
             tiles = maptiles.tiles[tiles]
+    return tiles
+
 
-    template = env.get_template(template)
+def _count_layers(geojson):
+    """ Return the number of Leaflet layers needed to draw a geojson """
+    return sum(len(f['geometry']['coordinates'])
+               if f['geometry']['type'] == 'MultiPoint' else 1
+               for f in geojson['features'])
 
+
+def _get_fig(fig):
     if fig is None:
+        import matplotlib.pyplot as plt
         fig = plt.gcf()
-    dpi = fig.get_dpi()
+    return fig
 
-    renderer = LeafletRenderer(crs=crs, epsg=epsg)
-    exporter = Exporter(renderer)
-    exporter.run(fig)
 
-    attribution = _attribution + ' | ' + tiles[1]
+def _render(fig=None, profile=None, **kwargs):
+    """
+    Run a LeafletRenderer over a figure, gcf() by default
+
+    matplotlib.pyplot and mplexporter are only imported here so that working
+    with GeoJSON alone doesn't load them.
 
-    mapid = str(uuid.uuid4()).replace('-', '')
+    """
+    from .mplexporter.exporter import Exporter
+    from .leaflet_renderer import LeafletRenderer
 
-    FloatEncoder._formatter = ".{}f".format(float_precision)
-    gjdata = json.dumps(renderer.geojson(), cls=FloatEncoder)
-    params = {
-        'geojson': gjdata,
-        'width': fig.get_figwidth()*dpi,
-        'height': fig.get_figheight()*dpi,
+    fig = _get_fig(fig)
+    renderer = LeafletRenderer(**kwargs)
+    exporter = Exporter(renderer)
+    if profile is not None:
+        if renderer.transformfunc:
+            renderer.transformfunc = profile.wrap('reproject',
+                                                  renderer.transformfunc)
+        if renderer.simplify:
+            renderer._simplify_ring = profile.wrap('simplify',
+                                                   renderer._simplify_ring)
+        profile.instrument(exporter)
+        with profile.stage('export'):
+            exporter.run(fig)
+        profile.count(renderer)
+    else:
+        exporter.run(fig)
+    return fig, renderer
+
+
+def _iter_html(fig=None, template='base.html', tiles=None, crs=None,
+               epsg=None, embed_links=False, float_precision=6,
+               simplify=None, canvas=None, canvas_threshold=2000,
+               encoding='json', cull=False, cache=None, profile=None):
+    """
+    Generate the html of fig_to_html() in chunks
+
+    The figure is exported right away; the html is generated as the
+    returned iterator is consumed. With a cache the html is rendered, or
+    looked up, in full.
+
+    """
+    if encoding not in ('json', 'delta'):
+        raise ValueError('Unknown encoding "{}"'.format(encoding))
+    tiles = _get_tiles(tiles)
+    profile = get_profile(profile)
+
+    mapid = None
+    if cache not in (None, False):
+        from .cache import figure_hash, get_cache
+        cache = get_cache(cache)
+        fig = _get_fig(fig)
+        key = figure_hash(fig, output='html', template=template, tiles=tiles,
+                          crs=crs, epsg=epsg, embed_links=embed_links,
+                          float_precision=float_precision, simplify=simplify,
+                          canvas=canvas, canvas_threshold=canvas_threshold,
+                          encoding=encoding, cull=cull)
+        if profile is not None:
+            with profile.stage('cache'):
+                html = cache.get(key)
+        else:
+            html = cache.get(key)
+        if html is not None:
+            if profile is not None:
+                profile.add('cache', 0., bytes=len(html.encode('utf8')))
+                profile.finish()
+            return iter([html])
+        mapid = key[:32]
+
+    fig, renderer = _render(fig, profile, crs=crs, epsg=epsg,
+                            simplify=simplify)
+    dpi = fig.get_dpi()
+    chunks = _iter_geojson_html(renderer.geojson(),
+                                width=fig.get_figwidth()*dpi,
+                                height=fig.get_figheight()*dpi,
+                                template=template, tiles=tiles,
+                                embed_links=embed_links,
+                                float_precision=float_precision,
+                                canvas=canvas,
+                                canvas_threshold=canvas_threshold,
+                                encoding=encoding, mapid=mapid,
+                                bounds=renderer.feature_bounds(), cull=cull,
+                                profile=profile)
+    if mapid is not None:
+        html = ''.join(chunks)
+        cache.set(key, html)
+        return iter([html])
+    return chunks
+
+
+def _new_mapid():
+    return str(uuid.uuid4()).replace('-', '')
+
+
+def _script_json(text):
+    # Keep "</script>" in strings, e.g. of the icons' SVG or of properties
+    # read from a GeoJSON file, from ending the script tag
+    return text.replace('</', '<\\/')
+
+
+def _map_params(width, height, mapid, tiles, embed_links, canvas):
+    """ Return the template parameters common to all the map pages """
+    tiles = _get_tiles(tiles)
+    return {
+        'width': width,
+        'height': height,
         'mapid': mapid,
         'tile_url': tiles[0],
-        'attribution': attribution,
+        'attribution': _attribution + ' | ' + tiles[1],
         'links': [_leaflet_js,_leaflet_css],
         'embed_links': embed_links,
+        'canvas': canvas,
     }
-    html = template.render(params)
 
-    return html
 
+def _union_bounds(a, b):
+    """ Return the union of two [[south, west], [north, east]] or None """
+    if a is None or b is None:
+        return b if a is None else a
+    return [[min(a[0][0], b[0][0]), min(a[0][1], b[0][1])],
+            [max(a[1][0], b[1][0]), max(a[1][1], b[1][1])]]
 
-def fig_to_geojson(fig=None, **kwargs):
+
+def _geojson_params(geojson, width, height, mapid, tiles, embed_links,
+                    float_precision, canvas, canvas_threshold, encoding,
+                    bounds, cull):
+    """
+    Return the template parameters of a map of a FeatureCollection
+
+    Everything but the 'geojson' itself. See _iter_geojson_html().
+
+    """
+    from . import tiling
+
+    if bounds is None:
+        bounds = tiling.feature_bounds(geojson['features'])
+    total_bounds = tiling.total_bounds(geojson['features'], bounds)
+    for image in geojson.get('images', []):
+        total_bounds = _union_bounds(total_bounds, image['bounds'])
+    index = tiling.grid_index(bounds, float_precision) if cull else None
+
+    if canvas is None:
+        canvas = _count_layers(geojson) > canvas_threshold
+
+    params = _map_params(width, height, mapid, tiles, embed_links, canvas)
+    params['encoding'] = encoding
+    params['bounds'] = json.dumps(total_bounds) if total_bounds else None
+    params['index'] = json.dumps(index) if index else None
+    params['images'] = bool(geojson.get('images'))
+    return params
+
+
+def _iter_geojson_html(geojson, width=640, height=480, template='base.html',
+                       tiles=None, embed_links=False, float_precision=6,
+                       canvas=None, canvas_threshold=2000, encoding='json',
+                       mapid=None, bounds=None, cull=False, profile=None):
+    """
+    Generate the html of a map of a FeatureCollection in chunks
+
+    The GeoJSON is not rendered into the template as one string. Instead the
+    template output is split where the GeoJSON goes and the features are
+    encoded one at a time in between. A random mapid is used if none is
+    given. The time taken by each is recorded in profile, if given, and
+    profile.finish() is called at the end.
+
+    bounds are the feature bounds, from LeafletRenderer.feature_bounds().
+    They are computed from the GeoJSON if not given.
+
+    """
+    from .utils import iterencode_geojson
+
+    template = get_template(template)
+    if mapid is None:
+        mapid = _new_mapid()
+    placeholder = '__mplleaflet_geojson_{}__'.format(mapid)
+
+    params = _geojson_params(geojson, width, height, mapid, tiles,
+                             embed_links, float_precision, canvas,
+                             canvas_threshold, encoding, bounds, cull)
+    params['geojson'] = placeholder
+    chunks = template.generate(params)
+    if profile is not None:
+        # The bytes are counted without the placeholder, below
+        chunks = profile.iter_stage('template', chunks, count_bytes=False)
+    for chunk in chunks:
+        parts = chunk.split(placeholder)
+        for i, part in enumerate(parts):
+            if i:
+                gjchunks = (_script_json(gjchunk) for gjchunk in
+                            iterencode_geojson(geojson, float_precision,
+                                               encoding))
+                if profile is not None:
+                    gjchunks = profile.iter_stage('encode', gjchunks)
+                for gjchunk in gjchunks:
+                    yield gjchunk
+            if part:
+                if profile is not None:
+                    profile.add('template', 0., bytes=len(part.encode('utf8')))
+                yield part
+    if profile is not None:
+        profile.finish()
+
+
+def fig_to_geojson(fig=None, cache=None, profile=None, **kwargs):
     """
     Returns a figure's GeoJSON representation as a dictionary
 
-    All arguments passed to fig_to_html()
+    The cache and profile arguments work as in fig_to_html(). Other
+    arguments are passed to the LeafletRenderer.
 
     Returns
     -------
-    GeoJSON dictionary
+    GeoJSON dictionary. Marker icons are in a top-level "icons" list of
+    dictionaries with the SVG "html", its "anchor_x" and "anchor_y", and
+    the "radius" and "style" of the circle drawn instead on a canvas. Point
+    features refer to theirs by index, as properties.icon. Before
+    icons were shared, each point feature had its own "html", "anchor_x"
+    and "anchor_y" properties.
 
     """
-    if fig is None:
-        fig = plt.gcf()
-    renderer = LeafletRenderer(**kwargs)
-    exporter = Exporter(renderer)
-    exporter.run(fig)
-
-    return renderer.geojson()
+    profile = get_profile(profile)
+    if cache not in (None, False):
+        from .cache import figure_hash, get_cache
+        cache = get_cache(cache)
+        fig = _get_fig(fig)
+        key = figure_hash(fig, output='geojson', **kwargs)
+        text = cache.get(key)
+        if text is None:
+            text = json.dumps(_render(fig, profile, **kwargs)[1].geojson())
+            cache.set(key, text)
+        geojson = json.loads(text)
+    else:
+        geojson = _render(fig, profile, **kwargs)[1].geojson()
+
+    if profile is not None:
+        profile.finish()
+    return geojson
+
+
+def _write_chunks(fileobj, chunks):
+    """
+    Write chunks of text to a filename or a file object, then close it
 
+    A file is written next to the filename first, and only replaces it once
+    every chunk is written, so that an error part way, e.g. while encoding,
+    doesn't leave a truncated page.
 
-def save_html(fig=None, fileobj='_map.html', **kwargs):
-    if isinstance(fileobj, str):
-        fileobj = open(fileobj, 'w')
+    """
+    if isinstance(fileobj, six.string_types):
+        path = fileobj
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return
     if not hasattr(fileobj, 'write'):
         raise ValueError("fileobj should be a filename or a writable file")
-    html = fig_to_html(fig, **kwargs)
-    fileobj.write(html)
-    fileobj.close()
+    try:
+        for chunk in chunks:
+            fileobj.write(chunk)
+    finally:
+        fileobj.close()
+
+
+def save_html(fig=None, fileobj='_map.html', **kwargs):
+    """
+    Convert a Matplotlib Figure to a Leaflet map and write it to a file
+
+    The html is written in chunks as it is generated, so the full page is
+    never held in memory.
+
+    Parameters
+    ----------
+    fig : figure, default gcf()
+        Figure used to convert to map
+    fileobj : string or file-like, default '_map.html'
+        Filename or writable file object. It is closed when done. A file
+        is only replaced once the whole page is written.
+
+    See fig_to_html() for description of keyword args.
+
+    """
+    _write_chunks(fileobj, _iter_html(fig, **kwargs))
 
 
-def display(fig=None, closefig=True, **kwargs):
+def save_geojson(fig=None, fileobj='_map.geojson', float_precision=6,
+                 **kwargs):
+    """
+    Write a figure's GeoJSON representation to a file
+
+    The features are encoded and written one at a time.
+
+    Parameters
+    ----------
+    fig : figure, default gcf()
+        Figure used to convert to GeoJSON
+    fileobj : string or file-like, default '_map.geojson'
+        Filename or writable file object. It is closed when done.
+    float_precision : int, default 6
+        The precision to be used for the floats in the geojson.
+
+    Other arguments are passed to fig_to_geojson()
+
+    """
+    from .utils import iterencode_geojson
+
+    geojson = fig_to_geojson(fig, **kwargs)
+    _write_chunks(fileobj, iterencode_geojson(geojson, float_precision))
+
+
+def save_tiles(fig=None, path='_map_tiles', minzoom=0, maxzoom=12,
+               tiles=None, crs=None, epsg=None, embed_links=False,
+               float_precision=6, canvas=None, canvas_threshold=2000):
+    """
+    Convert a Matplotlib Figure to a tiled Leaflet map
+
+    The features are cut into z/x/y GeoJSON tiles, simplified for each zoom
+    level, so the page only loads the data in view. Use this for figures too
+    large to embed in a single page.
+
+    Parameters
+    ----------
+    fig : figure, default gcf()
+        Figure used to convert to map
+    path : string, default '_map_tiles'
+        Directory where the tiles are written as z/x/y.json, along with the
+        index.html page loading them. The tiles of an earlier export to
+        the same directory are removed. Browsers usually refuse to load the
+        tiles from file:// urls, so the directory should be served over
+        HTTP. If path ends with '.mbtiles', the tiles are instead written to
+        an MBTiles (SQLite) file and no html is written.
+    minzoom, maxzoom : int, default 0, 12
+        The range of zoom levels to generate tiles for. At lower zoom levels
+        the page loads minzoom tiles, at higher zoom levels maxzoom tiles.
+
+    See fig_to_html() for description of the other keyword args.
+
+    """
+    from . import tiling
+
+    fig, renderer = _render(fig, crs=crs, epsg=epsg)
+    geojson = renderer.geojson()
+
+    if path.endswith('.mbtiles'):
+        tiling.write_mbtiles(geojson, path, minzoom, maxzoom, float_precision)
+        return
+
+    tiling.write_tile_directory(geojson, path, minzoom, maxzoom,
+                                float_precision)
+
+    if canvas is None:
+        canvas = _count_layers(geojson) > canvas_threshold
+    bounds = tiling.total_bounds(geojson['features'],
+                                 renderer.feature_bounds())
+
+    dpi = fig.get_dpi()
+    params = _map_params(fig.get_figwidth()*dpi, fig.get_figheight()*dpi,
+                         _new_mapid(), tiles, embed_links, canvas)
+    params.update({
+        'icons': _script_json(json.dumps(geojson.get('icons', []))),
+        'bounds': json.dumps(bounds) if bounds else None,
+        'minzoom': minzoom,
+        'maxzoom': maxzoom,
+        'tile_path': '',
+    })
+    with open(os.path.join(path, 'index.html'), 'w') as f:
+        for chunk in get_template('tiled.html').generate(params):
+            f.write(chunk)
+
+
+def display(fig=None, closefig=True, backend='iframe', **kwargs):
     """
     Convert a Matplotlib Figure to a Leaflet map. Embed in IPython notebook.
 
@@ -147,13 +563,28 @@ def display(fig=None, closefig=True, **kwargs):
         Figure used to convert to map
     closefig : boolean, default True
         Close the current Figure
+    backend : string, default 'iframe'
+        'iframe' embeds the page as a base64 data URI. 'widget' returns a
+        mplleaflet.widget.MapWidget instead, which sends the GeoJSON to the
+        notebook as a binary buffer and can be updated in place. It requires
+        anywidget.
+
+    Other arguments are passed to fig_to_html(), or to MapWidget.
     """
-    from IPython.display import HTML
+    import matplotlib.pyplot as plt
+    if backend not in ('iframe', 'widget'):
+        raise ValueError('Unknown backend "{}"'.format(backend))
     if fig is None:
         fig = plt.gcf()
     if closefig:
         plt.close(fig)
 
+    if backend == 'widget':
+        from .widget import MapWidget
+        return MapWidget(fig, **kwargs)
+
+    from IPython.display import HTML
+
     html = fig_to_html(fig, **kwargs)
 
     # We embed everything in an iframe.
@@ -175,11 +606,14 @@ def show(fig=None, path='_map.html', **kwargs):
     path : string, default '_map.html'
         Filename where output html will be saved
 
-    See fig_to_html() for description of keyword args.
+    See fig_to_html() for description of keyword args. In a job of a
+    batch conversion, the map is saved but not opened.
 
     """
     import webbrowser
+    from . import _batch
     fullpath = os.path.abspath(path)
     with open(fullpath, 'w') as f:
         save_html(fig, fileobj=f, **kwargs)
-    webbrowser.open('file://' + fullpath)
+    if not _batch._in_job:
+        webbrowser.open('file://' + fullpath)
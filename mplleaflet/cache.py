@@ -0,0 +1,324 @@
+"""
+Cache of rendered maps keyed on the content of their figure
+
+Rendering the same figure twice with the same arguments gives the same
+output, so repeated calls to fig_to_html() on an unchanged figure can skip
+the export. Pass a RenderCache, or True for the default in-memory one, as the
+cache argument of fig_to_html(), save_html() or fig_to_geojson().
+
+"""
+from __future__ import absolute_import
+
+import collections
+import errno
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+# Bump when the output for a given figure changes, to invalidate disk caches
+_cache_version = 1
+
+# Getters whose values determine how an artist is exported. zorder is left
+# out: it doesn't change the output, and the exporter raises the zorder of
+# legend artists every time it draws them.
+_artist_getters = [
+    'xydata', 'offsets', 'paths', 'path', 'patch_transform', 'transforms',
+    'array', 'extent', 'sizes', 'color', 'facecolor', 'edgecolor',
+    'facecolors', 'edgecolors', 'linewidth', 'linewidths', 'linestyle',
+    'dashes', 'drawstyle', 'marker', 'markersize', 'markeredgecolor',
+    'markerfacecolor', 'markeredgewidth', 'fill', 'alpha', 'visible',
+    'text',
+]
+
+
+def _update(h, value):
+    """ Feed a value into a hash, arrays and paths by their data """
+    if hasattr(value, 'vertices') and hasattr(value, 'codes'):
+        # matplotlib Path
+        _update(h, value.vertices)
+        _update(h, value.codes)
+    elif hasattr(value, 'get_matrix'):
+        # matplotlib Transform
+        _update(h, value.get_matrix())
+    elif isinstance(value, np.ndarray):
+        h.update('{}{}'.format(value.dtype, value.shape).encode('utf8'))
+        if np.ma.isMaskedArray(value):
+            _update(h, np.ma.getmaskarray(value))
+            value = np.ma.getdata(value)
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update('[{}'.format(len(value)).encode('utf8'))
+        for v in value:
+            _update(h, v)
+    else:
+        h.update(repr(value).encode('utf8'))
+
+
+def artist_hash(artist):
+    """
+    Return a hash of everything about an artist that affects its export
+
+    Only the state that doesn't change when the artist is drawn is hashed,
+    so that the hash is the same before and after the first draw. The
+    colors of a colormapped collection are only computed from its array
+    when it's drawn, so they are updated first. The transforms of a
+    collection with sizes, e.g. a scatter, are scaled to the dpi it was
+    last drawn at, so its sizes and the figure's dpi are hashed instead.
+
+    """
+    update_scalarmappable = getattr(artist, 'update_scalarmappable', None)
+    if update_scalarmappable is not None:
+        update_scalarmappable()
+    getters = _artist_getters
+    h = hashlib.sha1()
+    _update(h, type(artist).__name__)
+    if hasattr(artist, 'get_sizes'):
+        getters = [name for name in getters if name != 'transforms']
+        figure = artist.get_figure()
+        _update(h, None if figure is None else figure.get_dpi())
+    for name in getters:
+        getter = getattr(artist, 'get_' + name, None)
+        if getter is None:
+            continue
+        try:
+            value = getter()
+        except Exception:
+            continue
+        _update(h, name)
+        _update(h, value)
+    return h.hexdigest()
+
+
+def iter_artists(fig):
+    """ Iterate over the artists of a figure that the exporter draws """
+    for ax in fig.axes:
+        for artist in iter_axes_artists(ax):
+            yield artist
+
+
+def iter_axes_artists(ax):
+    """ Iterate over the artists of one axes that the exporter draws """
+    for artists in (ax.lines, ax.patches, ax.collections, ax.images):
+        for artist in artists:
+            yield artist
+    legend = ax.get_legend()
+    if legend is not None:
+        for artist in legend.get_children():
+            yield artist
+        for artists in (legend.get_lines(), legend.get_patches(),
+                        legend.get_texts()):
+            for artist in artists:
+                yield artist
+
+
+def figure_hash(fig, **kwargs):
+    """
+    Return a hash of a figure's content and the arguments it's rendered with
+
+    Parameters
+    ----------
+    fig : figure
+        The figure to hash
+    kwargs
+        The rendering arguments, e.g. those of fig_to_html(). Values must be
+        JSON serializable or have a stable repr().
+
+    """
+    h = hashlib.sha1()
+    _update(h, _cache_version)
+    _update(h, json.dumps(kwargs, sort_keys=True, default=repr))
+    _update(h, [fig.get_figwidth(), fig.get_figheight(), fig.get_dpi()])
+    for ax in fig.axes:
+        _update(h, [ax.get_xlim(), ax.get_ylim(), len(ax.get_children())])
+    for artist in iter_artists(fig):
+        h.update(artist_hash(artist).encode('ascii'))
+    return h.hexdigest()
+
+
+class RenderCache(object):
+    """
+    LRU cache of rendered output with size-based eviction
+
+    Values are strings kept in memory and, optionally, in a directory on
+    disk shared between processes. The least recently used entries are
+    evicted once the total size exceeds the limits.
+
+    Parameters
+    ----------
+    maxsize : int, default 64 MB
+        Maximum total size of the values kept in memory, in characters
+    directory : string, default None
+        If given, values are also written there and looked up on memory
+        misses
+    disk_maxsize : int, default 1 GB
+        Maximum total size of the files in directory, in bytes. The
+        directory is only listed when the size tracked by this cache goes
+        over it, and then trimmed to three quarters of it, so other
+        processes' writes are only counted from then on.
+
+    """
+    def __init__(self, maxsize=64 * 2**20, directory=None,
+                 disk_maxsize=2**30):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+        self._size = 0
+        # Total size of the files in directory, None until it's listed
+        self._disk_size = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """ Return the value cached for key, or None """
+        with self._lock:
+            value = self._items.pop(key, None)
+            if value is not None:
+                # Move to the most recently used end
+                self._items[key] = value
+                self.hits += 1
+                return value
+
+        value = self._get_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._set_memory(key, value)
+        return value
+
+    def set(self, key, value):
+        """ Cache value, a string, for key """
+        self._set_memory(key, value)
+        self._set_disk(key, value)
+
+    def clear(self):
+        """ Remove all entries from memory and disk """
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+            self._disk_size = None
+        if self.directory is not None and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                _remove(self._path(name))
+
+    def _set_memory(self, key, value):
+        if len(value) > self.maxsize:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.maxsize:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _get_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read().decode('utf8')
+            # Record the access for LRU eviction
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        return value
+
+    def _set_disk(self, key, value):
+        if self.directory is None:
+            return
+        data = value.encode('utf8')
+        if len(data) > self.disk_maxsize:
+            return
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                # Another process may have just made it
+                if not os.path.isdir(self.directory):
+                    raise
+        path = self._path(key)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        old_size = _file_size(path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = self._list_disk()[1]
+            else:
+                self._disk_size += len(data) - old_size
+            if self._disk_size <= self.disk_maxsize:
+                return
+        self._evict_disk()
+
+    def _list_disk(self):
+        """ Return the (mtime, size, name) of the entries and their total """
+        entries = []
+        for name in os.listdir(self.directory):
+            # Skip the files other processes are still writing
+            if name.endswith('.tmp'):
+                continue
+            try:
+                stat = os.stat(self._path(name))
+            except OSError:
+                # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict_disk(self):
+        # Trim below the limit, so that the directory isn't listed again on
+        # every write once it's full
+        entries, total = self._list_disk()
+        target = self.disk_maxsize * 3 // 4
+        for _, size, name in sorted(entries):
+            if total <= target:
+                break
+            _remove(self._path(name))
+            total -= size
+        with self._lock:
+            self._disk_size = total
+
+
+def _file_size(path):
+    """ Return the size of a file, or 0 if it doesn't exist """
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _remove(path):
+    """ Remove a file that another process may have removed already """
+    try:
+        os.remove(path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+
+
+default_cache = RenderCache()
+
+
+def get_cache(cache):
+    """ Resolve a cache argument: a RenderCache, or True for the default """
+    if cache is True:
+        return default_cache
+    return cache
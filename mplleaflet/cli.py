@@ -0,0 +1,182 @@
+"""
+Command line interface: convert saved figures and GeoJSON to Leaflet maps
+
+    $ mplleaflet -o maps/ -j 4 --epsg 26986 figures/*.pkl track.geojson
+
+matplotlib.pyplot is only imported by the jobs that need it, so converting
+GeoJSON files doesn't pay for it.
+
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import os
+import pickle
+import sys
+
+from . import maptiles
+from ._batch import run_jobs
+from ._display import _iter_geojson_html, save_html
+from .geo import to_geojson
+
+_geojson_exts = ('.geojson', '.json')
+_pickle_exts = ('.pkl', '.pickle')
+_script_exts = ('.py',)
+
+# fig_to_html() arguments that apply to GeoJSON input
+_geojson_kwargs = ('tiles', 'embed_links', 'float_precision', 'encoding')
+
+
+def convert_geojson(src, dst, kwargs):
+    """ Convert a GeoJSON file to a map without going through matplotlib """
+    with open(src) as f:
+        geojson = to_geojson(json.load(f))
+    kwargs = dict((k, v) for k, v in kwargs.items() if k in _geojson_kwargs)
+    with open(dst, 'w') as f:
+        for chunk in _iter_geojson_html(geojson, **kwargs):
+            f.write(chunk)
+
+
+def convert_pickle(src, dst, kwargs):
+    """ Convert a pickled matplotlib Figure to a map """
+    with open(src, 'rb') as f:
+        fig = pickle.load(f)
+    save_html(fig, fileobj=dst, **kwargs)
+
+
+def convert_script(src, dst, kwargs):
+    """
+    Run a Python script and convert each figure it leaves open to a map
+
+    With several figures, the figure number is appended to dst. Figures
+    that were already open aren't converted or closed.
+
+    """
+    import runpy
+    import matplotlib.pyplot as plt
+
+    before = set(plt.get_fignums())
+    runpy.run_path(src, run_name='__main__')
+    fignums = [num for num in plt.get_fignums() if num not in before]
+    root, ext = os.path.splitext(dst)
+    for num in fignums:
+        path = dst if len(fignums) == 1 else '{}_{}{}'.format(root, num, ext)
+        save_html(plt.figure(num), fileobj=path, **kwargs)
+
+
+def _converter(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _geojson_exts:
+        return convert_geojson
+    if ext in _pickle_exts:
+        return convert_pickle
+    if ext in _script_exts:
+        return convert_script
+    raise ValueError('Unknown input type: {}'.format(path))
+
+
+def _output_path(path, output_dir):
+    root = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir or os.path.dirname(path), root + '.html')
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog='mplleaflet',
+        description='Convert pickled matplotlib figures, GeoJSON files and '
+                    'plotting scripts to Leaflet maps.')
+    parser.add_argument(
+        'inputs', nargs='+', metavar='INPUT',
+        help='pickled figure ({}), GeoJSON ({}) or Python script ({}). A '
+             'script is run and every figure it leaves open is converted.'
+             .format(', '.join(_pickle_exts), ', '.join(_geojson_exts),
+                     ', '.join(_script_exts)))
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='directory of the html files, next to each input by default. '
+             'Inputs must then have different names.')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of worker processes, 0 for one per CPU (default: 1)')
+    parser.add_argument(
+        '--tiles', default='osm',
+        help='tile source: one of {} or a tile url (default: osm)'
+             .format(', '.join(sorted(maptiles.tiles))))
+    parser.add_argument(
+        '--attribution', default='',
+        help='attribution of the tiles when --tiles is a url')
+    crs = parser.add_mutually_exclusive_group()
+    crs.add_argument('--epsg', type=int,
+                     help='EPSG code of the figures\' coordinates')
+    crs.add_argument('--crs', type=json.loads,
+                     help='pyproj definition of the figures\' coordinates '
+                          'as a JSON object')
+    parser.add_argument(
+        '--precision', type=int, default=6,
+        help='number of decimals of the coordinates (default: 6)')
+    parser.add_argument(
+        '--simplify', type=float,
+        help='simplify lines and polygons with this tolerance in degrees')
+    parser.add_argument(
+        '--encoding', choices=['json', 'delta'], default='json',
+        help='encoding of the coordinates in the page (default: json)')
+    parser.add_argument(
+        '--embed-links', action='store_true',
+        help='embed Leaflet in the page instead of linking to it')
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+
+    tiles = args.tiles
+    if tiles not in maptiles.tiles:
+        tiles = (tiles, args.attribution)
+    kwargs = {
+        'tiles': tiles,
+        'crs': args.crs,
+        'epsg': args.epsg,
+        'float_precision': args.precision,
+        'simplify': args.simplify,
+        'encoding': args.encoding,
+        'embed_links': args.embed_links,
+    }
+
+    jobs = []
+    outputs = {}
+    for path in args.inputs:
+        try:
+            converter = _converter(path)
+        except ValueError as e:
+            print('error: {}'.format(e), file=sys.stderr)
+            return 2
+        output = _output_path(path, args.output_dir)
+        # Inputs of the same name in different directories would overwrite
+        # each other's map in the output directory
+        key = os.path.normcase(os.path.abspath(output))
+        if key in outputs:
+            print('error: {} and {} are both converted to {}'.format(
+                outputs[key], path, output), file=sys.stderr)
+            return 2
+        outputs[key] = path
+        jobs.append((output, converter, (path, output, kwargs)))
+
+    if args.output_dir and not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    def report(result):
+        src = args.inputs[result.index]
+        if result.error is None:
+            print('{} -> {} ({:.2f}s)'.format(src, result.path,
+                                              result.seconds),
+                  file=sys.stderr)
+        else:
+            print('{} failed:\n{}'.format(src, result.error), file=sys.stderr)
+
+    results = run_jobs(jobs, processes=args.jobs or None, callback=report)
+    return 1 if any(r.error is not None for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
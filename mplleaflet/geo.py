@@ -0,0 +1,232 @@
+"""
+Maps of data that is already longitude / latitude, without matplotlib
+
+Plotting lon/lat arrays only to convert the figure back to coordinates
+pays for pyplot, the mplexporter crawl and the display to data
+transformations. The functions here build the FeatureCollection directly
+from NumPy arrays, GeoJSON dictionaries and objects with a
+__geo_interface__, then go through the same templates and encoder as
+fig_to_html()::
+
+    html = mplleaflet.geo_to_html(np.column_stack([lon, lat]),
+                                  color='#FF0000', weight=3)
+
+"""
+from __future__ import absolute_import
+
+import six
+
+from ._display import _iter_geojson_html, _write_chunks
+
+# Style arguments and the Leaflet path options they set
+_style_options = [
+    ('color', 'color'),
+    ('weight', 'weight'),
+    ('opacity', 'opacity'),
+    ('fill_color', 'fillColor'),
+    ('fill_opacity', 'fillOpacity'),
+    ('dash_array', 'dashArray'),
+]
+
+_geometries = ('LineString', 'Polygon', 'MultiPoint')
+
+
+def _css_color(color):
+    """ Return a color as a CSS string. Sequences are RGB(A) in [0, 1]. """
+    if color is None or isinstance(color, six.string_types):
+        return color
+    r, g, b = [int(round(255 * c)) for c in tuple(color)[:3]]
+    return '#{:02X}{:02X}{:02X}'.format(r, g, b)
+
+
+def _leaflet_style(color=None, weight=None, opacity=None, fill_color=None,
+                   fill_opacity=None, dash_array=None):
+    args = dict(color=_css_color(color), weight=weight, opacity=opacity,
+                fill_color=_css_color(fill_color), fill_opacity=fill_opacity,
+                dash_array=dash_array)
+    return dict((option, args[name]) for name, option in _style_options
+                if args[name] is not None)
+
+
+def _array_feature(data, geometry, is_polygon):
+    import numpy as np
+
+    data = np.asarray(data, dtype=float)
+    if data.ndim != 2 or data.shape[1] != 2:
+        raise ValueError('Coordinate arrays should have shape (N, 2), '
+                         'got {}'.format(data.shape))
+    if geometry is None:
+        geometry = 'Polygon' if is_polygon else 'LineString'
+    if geometry not in _geometries:
+        raise ValueError('geometry should be one of {}'.format(
+            ', '.join(_geometries)))
+
+    coords = data.tolist()
+    if geometry == 'Polygon':
+        if coords and coords[0] != coords[-1]:
+            coords.append(coords[0])
+        coords = [coords]
+    return {'type': 'Feature',
+            'geometry': {'type': geometry, 'coordinates': coords},
+            'properties': {}}
+
+
+def _iter_collections(data, geometry, is_polygon):
+    """ Generate a FeatureCollection for each item of data """
+    if hasattr(data, '__geo_interface__'):
+        data = data.__geo_interface__
+
+    if isinstance(data, dict):
+        kind = data.get('type')
+        if kind == 'FeatureCollection':
+            yield data
+        elif kind == 'Feature':
+            yield {'type': 'FeatureCollection', 'features': [data]}
+        elif kind is not None:
+            yield {'type': 'FeatureCollection', 'features': [
+                {'type': 'Feature', 'geometry': data, 'properties': {}}]}
+        else:
+            raise ValueError('GeoJSON dictionary without a type')
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            for fc in _iter_collections(item, geometry, is_polygon):
+                yield fc
+    elif hasattr(data, 'shape') and hasattr(data, 'dtype'):
+        yield {'type': 'FeatureCollection',
+               'features': [_array_feature(data, geometry, is_polygon)]}
+    else:
+        raise ValueError("Can't convert {} to GeoJSON".format(
+            type(data).__name__))
+
+
+def to_geojson(data, geometry=None, simplify=None, **style):
+    """
+    Return a FeatureCollection of longitude / latitude data
+
+    Parameters
+    ----------
+    data : array, dict, object or list of them
+        Each item is one of:
+
+        * a NumPy array of shape (N, 2) of longitude, latitude rows
+        * a GeoJSON FeatureCollection, Feature or geometry dictionary,
+          e.g. the output of fig_to_geojson()
+        * an object with a __geo_interface__, e.g. a shapely geometry
+
+        Items of lists and tuples are added in order. Only NumPy arrays
+        are read as coordinates, not lists of numbers.
+    geometry : string, default None
+        The geometry of arrays: 'LineString', 'Polygon' or 'MultiPoint'.
+        Arrays are polygons if fill_color is given, lines otherwise.
+    simplify : float, default None
+        If given, lines and polygon rings are simplified with
+        Douglas-Peucker using this tolerance in degrees
+    color, weight, opacity, fill_color, fill_opacity, dash_array
+        Style of the features, as Leaflet path options. Colors are CSS
+        strings or RGB(A) sequences with values in [0, 1]. The style
+        overrides the same options in the properties of the input features.
+
+    Returns
+    -------
+    GeoJSON dictionary
+
+    """
+    style = _leaflet_style(**style)
+    features, icons, images = [], [], []
+    for fc in _iter_collections(data, geometry, 'fillColor' in style):
+        # Point features refer to icons by index, so offset them to the
+        # icons of the collections before
+        offset = len(icons)
+        for feature in fc['features']:
+            properties = dict(feature.get('properties') or {})
+            if offset and 'icon' in properties:
+                properties['icon'] += offset
+            properties.update(style)
+            features.append(dict(feature, properties=properties))
+        icons.extend(fc.get('icons', []))
+        images.extend(fc.get('images', []))
+
+    if simplify:
+        features = [_simplify_feature(f, simplify) for f in features]
+
+    geojson = {'type': 'FeatureCollection', 'features': features}
+    if icons:
+        geojson['icons'] = icons
+    if images:
+        geojson['images'] = images
+    return geojson
+
+
+def _simplify_feature(feature, tolerance):
+    from . import utils
+
+    geometry = feature['geometry']
+    kind = geometry['type']
+    if kind == 'LineString':
+        coords = utils.simplify(geometry['coordinates'], tolerance).tolist()
+    elif kind in ('MultiLineString', 'Polygon'):
+        coords = []
+        for ring in geometry['coordinates']:
+            simplified = utils.simplify(ring, tolerance)
+            if kind == 'Polygon' and len(simplified) < 4:
+                # Don't collapse a polygon ring
+                coords.append(ring)
+            else:
+                coords.append(simplified.tolist())
+    else:
+        return feature
+    return dict(feature, geometry={'type': kind, 'coordinates': coords})
+
+
+def _split_kwargs(kwargs):
+    data_kwargs = {}
+    for name in ['geometry', 'simplify'] + [s[0] for s in _style_options]:
+        if name in kwargs:
+            data_kwargs[name] = kwargs.pop(name)
+    return data_kwargs
+
+
+def geo_to_html(data, width=640, height=480, **kwargs):
+    """
+    Convert longitude / latitude data to a Leaflet map
+
+    Parameters
+    ----------
+    data : array, dict, object or list of them
+        See to_geojson()
+    width, height : int, default 640 x 480
+        The size of the map in pixels
+
+    The geometry, simplify and style arguments are those of to_geojson().
+    The template, tiles, embed_links, float_precision, canvas,
+    canvas_threshold, encoding and cull arguments are those of
+    fig_to_html().
+
+    Returns
+    -------
+    html : string
+
+    """
+    return ''.join(_iter_geo_html(data, width, height, **kwargs))
+
+
+def _iter_geo_html(data, width=640, height=480, **kwargs):
+    geojson = to_geojson(data, **_split_kwargs(kwargs))
+    return _iter_geojson_html(geojson, width, height, **kwargs)
+
+
+def save_geo_html(data, fileobj='_map.html', **kwargs):
+    """
+    Convert longitude / latitude data to a Leaflet map and write it to a file
+
+    Parameters
+    ----------
+    data : array, dict, object or list of them
+        See to_geojson()
+    fileobj : string or file-like, default '_map.html'
+        Filename or writable file object. It is closed when done.
+
+    See geo_to_html() for description of keyword args.
+
+    """
+    _write_chunks(fileobj, _iter_geo_html(data, **kwargs))
@@ -0,0 +1,263 @@
+"""
+Several figures as toggleable layers of one map
+
+Comparing many figures as separate pages loads Leaflet and the base map
+once per page, and with embed_links=True carries a copy of Leaflet in
+each. layers_to_html() instead puts each figure, axes or GeoJSON on one
+map as an overlay of an L.control.layers. Leaflet is included once and the
+GeoJSON of each layer is kept in a script tag of type application/json,
+which is only parsed when the layer is first switched on::
+
+    html = mplleaflet.layers_to_html([('baseline', fig1),
+                                      ('scenario A', fig2)])
+
+The page is then as large as all the layers together. save_layers_html()
+can instead write the layers hidden at first to their own files, which the
+page only downloads when they are switched on::
+
+    mplleaflet.save_layers_html(layers, 'scenarios.html',
+                                layer_dir='scenarios')
+
+"""
+from __future__ import absolute_import
+
+import json
+import os
+
+import six
+
+from ._display import (_count_layers, _map_params, _new_mapid,
+                       _script_json, _union_bounds, _write_chunks,
+                       get_template)
+
+
+def _is_figure(obj):
+    return hasattr(obj, 'savefig') and hasattr(obj, 'axes')
+
+
+def _is_axes(obj):
+    return hasattr(obj, 'get_xlim') and hasattr(obj, 'figure')
+
+
+def _layer_items(layers):
+    """ Return a list of (name, layer) pairs with unique names """
+    if isinstance(layers, dict):
+        layers = layers.items()
+    items = []
+    for i, layer in enumerate(layers):
+        if isinstance(layer, tuple) and len(layer) == 2 and \
+                isinstance(layer[0], six.string_types):
+            name, layer = layer
+        else:
+            name = ''
+            if _is_figure(layer):
+                name = layer.get_label()
+            elif _is_axes(layer):
+                name = layer.get_title()
+            name = name or 'Layer {}'.format(i + 1)
+        items.append((name, layer))
+
+    names = [name for name, layer in items]
+    if len(set(names)) != len(names):
+        raise ValueError('Layer names must be unique')
+    return items
+
+
+def _export(obj, crs, epsg, simplify):
+    """ Return the GeoJSON and feature bounds of a figure or of one axes """
+    from .cache import iter_axes_artists
+    from .leaflet_renderer import LeafletRenderer
+    from .mplexporter.exporter import Exporter
+
+    renderer = LeafletRenderer(crs=crs, epsg=epsg, simplify=simplify)
+    if _is_axes(obj):
+        fig = obj.figure
+        renderer.skip_artists = set(
+            id(artist) for ax in fig.axes if ax is not obj
+            for artist in iter_axes_artists(ax))
+    else:
+        fig = obj
+    Exporter(renderer).run(fig)
+    return renderer.geojson(), renderer.feature_bounds()
+
+
+def _layer_bounds(geojson, bounds=None):
+    """ Return the LatLngBounds of a layer's features and images """
+    from . import tiling
+
+    layer_bounds = tiling.total_bounds(geojson['features'], bounds)
+    for image in geojson.get('images', []):
+        layer_bounds = _union_bounds(layer_bounds, image['bounds'])
+    return layer_bounds
+
+
+def _layer_geojson(items, crs, epsg, simplify):
+    """
+    Return the FeatureCollection of each layer, the icons they share and
+    the bounds of all of them
+
+    Point features refer to icons by index, so the icons of all the layers
+    are put in one list and the indices offset to match.
+
+    """
+    from .geo import to_geojson
+
+    layers, icons, total_bounds = [], [], None
+    for name, obj in items:
+        if _is_figure(obj) or _is_axes(obj):
+            geojson, bounds = _export(obj, crs, epsg, simplify)
+        else:
+            geojson, bounds = to_geojson(obj), None
+        total_bounds = _union_bounds(total_bounds,
+                                     _layer_bounds(geojson, bounds))
+        offset = len(icons)
+        icons.extend(geojson.pop('icons', []))
+        if offset:
+            features = []
+            for feature in geojson['features']:
+                properties = feature['properties']
+                if 'icon' in properties:
+                    properties = dict(properties,
+                                      icon=properties['icon'] + offset)
+                features.append(dict(feature, properties=properties))
+            geojson['features'] = features
+        layers.append(geojson)
+    return layers, icons, total_bounds
+
+
+def _iter_layers_html(layers, width=None, height=None,
+                      template='layers.html', tiles=None, crs=None,
+                      epsg=None, embed_links=False, float_precision=6,
+                      simplify=None, canvas=None, canvas_threshold=2000,
+                      encoding='json', visible=None, layer_url=None,
+                      write_layer=None):
+    """
+    Generate the html of the layers page in chunks
+
+    If layer_url is given, the layers that aren't visible are not inlined.
+    Instead write_layer(index, text) is called with the GeoJSON of each,
+    and the page fetches it from layer_url + '<index>.json'.
+
+    """
+    from .utils import iterencode_geojson
+
+    items = _layer_items(layers)
+    if not items:
+        raise ValueError('No layers to draw')
+    names = [name for name, layer in items]
+    if visible is None:
+        visible = names[:1]
+    unknown = set(visible) - set(names)
+    if unknown:
+        raise ValueError('Unknown layers: {}'.format(
+            ', '.join(sorted(unknown))))
+
+    if width is None or height is None:
+        figs = [obj if _is_figure(obj) else obj.figure
+                for name, obj in items if _is_figure(obj) or _is_axes(obj)]
+        if figs:
+            dpi = figs[0].get_dpi()
+            width = figs[0].get_figwidth() * dpi if width is None else width
+            height = (figs[0].get_figheight() * dpi if height is None
+                      else height)
+        else:
+            width = 640 if width is None else width
+            height = 480 if height is None else height
+
+    layer_collections, icons, bounds = _layer_geojson(items, crs, epsg,
+                                                      simplify)
+    if canvas is None:
+        canvas = sum(_count_layers(fc)
+                     for fc in layer_collections) > canvas_threshold
+    params = _map_params(width, height, _new_mapid(), tiles, embed_links,
+                         canvas)
+    params['encoding'] = encoding
+    params['bounds'] = json.dumps(bounds) if bounds else None
+    params['images'] = any(fc.get('images') for fc in layer_collections)
+    params['icons'] = _script_json(json.dumps(icons))
+    params['names'] = _script_json(json.dumps(names))
+    visible = [names.index(name) for name in visible]
+    params['visible'] = json.dumps(visible)
+    params['layer_url'] = json.dumps(layer_url)
+    params['layers'] = []
+    for i, fc in enumerate(layer_collections):
+        text = ''.join(iterencode_geojson(fc, float_precision, encoding))
+        if layer_url is None or i in visible:
+            params['layers'].append(_script_json(text))
+        else:
+            write_layer(i, text)
+            params['layers'].append(None)
+
+    return get_template(template).generate(params)
+
+
+def layers_to_html(layers, width=None, height=None, **kwargs):
+    """
+    Draw several figures, axes or GeoJSON as layers of one Leaflet map
+
+    Parameters
+    ----------
+    layers : list or dict
+        The layers, in the order of the layers control. Each is a
+        matplotlib Figure, an Axes, whose figure is drawn without its other
+        axes, or anything mplleaflet.to_geojson() accepts. A list may hold
+        (name, layer) pairs, otherwise layers are named after the figure's
+        label or the axes' title. Names must be unique.
+    width, height : int, default the size of the first figure
+        The size of the map in pixels
+    visible : list of strings, default the first layer
+        The names of the layers shown when the page loads. The others are
+        only decoded and drawn when switched on. All the layers are
+        exported and inlined in the page regardless, see
+        save_layers_html() to keep them out of the page.
+
+    See fig_to_html() for description of the other keyword args. crs, epsg
+    and simplify apply to every figure.
+
+    Returns
+    -------
+    String of html of the resulting webpage
+
+    """
+    return ''.join(_iter_layers_html(layers, width, height, **kwargs))
+
+
+def save_layers_html(layers, fileobj='_map.html', layer_dir=None, **kwargs):
+    """
+    Draw several figures as layers of one map and write it to a file
+
+    Parameters
+    ----------
+    layers : list or dict
+        See layers_to_html()
+    fileobj : string or file-like, default '_map.html'
+        Filename or writable file object. It is closed when done.
+    layer_dir : string, default None
+        If given, the layers that aren't visible when the page loads are
+        written to this directory as <index>.json instead of being inlined,
+        and the page only downloads one when it's switched on. The page
+        refers to the directory relative to fileobj if it's a filename.
+        Browsers don't let pages opened from disk download files, so the
+        page must then be served over HTTP, e.g. with python -m http.server.
+
+    See layers_to_html() for description of keyword args.
+
+    """
+    if layer_dir is None:
+        _write_chunks(fileobj, _iter_layers_html(layers, **kwargs))
+        return
+
+    if not os.path.isdir(layer_dir):
+        os.makedirs(layer_dir)
+    url = layer_dir
+    if isinstance(fileobj, six.string_types):
+        url = os.path.relpath(layer_dir,
+                              os.path.dirname(os.path.abspath(fileobj)))
+    url = url.replace(os.sep, '/').rstrip('/') + '/'
+
+    def write_layer(i, text):
+        _write_chunks(os.path.join(layer_dir, '{}.json'.format(i)), [text])
+
+    _write_chunks(fileobj, _iter_layers_html(layers, layer_url=url,
+                                             write_layer=write_layer,
+                                             **kwargs))
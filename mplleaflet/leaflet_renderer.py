@@ -1,51 +1,131 @@
 from __future__ import absolute_import
 
-from functools import partial
+import collections
+import json
 
-from jinja2 import Template
 from .mplexporter.renderers.base import Renderer
+from .mplexporter.utils import export_color
 import numpy as np
 
-from .utils import iter_rings
+from .utils import simplify, split_rings
 
 
-svg_template = Template("""<svg width="{{ width|int }}px" height="{{ height|int }}px" viewBox="{{ minx }} {{ miny }} {{ width }} {{ height }}" xmlns="http://www.w3.org/2000/svg" version="1.1">  <path d="{{ path }}" {% for k, v in style.items() %}{{ k }}="{{ v }}" {% endfor %}/></svg>""")
+# The markup of marker icons is fixed, so it's filled in with str.format
+# rather than a Jinja2 template. Values are written as Jinja2 would, with
+# str().
+_svg_source = ('<svg width="{width}px" height="{height}px" '
+               'viewBox="{minx} {miny} {size_x} {size_y}" '
+               'xmlns="http://www.w3.org/2000/svg" version="1.1">  '
+               '<path d="{path}" {style}/></svg>')
+
+def render_svg(path, style, width, height, minx, miny):
+    """ Return the SVG markup of a marker icon """
+    attributes = ''.join('{}="{}" '.format(k, v) for k, v in style.items())
+    return _svg_source.format(width=int(width), height=int(height),
+                              minx=str(minx), miny=str(miny),
+                              size_x=str(width), size_y=str(height),
+                              path=path, style=attributes)
 
 _marker_inflation = 1.25
 
 class LeafletRenderer(Renderer):
-    def __init__(self, crs=None, epsg=None):
+    """
+    Renderer converting a figure into a list of GeoJSON features
+
+    Parameters
+    ----------
+    crs : dict, default None
+        pyproj definition of the figure's coordinates. If None the figure is
+        assumed to be longitude / latitude.
+    epsg : int, default None
+        EPSG code of the figure's coordinates, in place of crs
+    simplify : float, default None
+        If given, lines and polygons are simplified with Douglas-Peucker
+        using this tolerance in output degrees. The number of vertices
+        dropped is counted in the vertices_removed attribute.
+
+    """
+    def __init__(self, crs=None, epsg=None, simplify=None):
         if crs is not None and epsg is not None:
             raise ValueError('crs and epsg cannot both be specified')
 
         if epsg is not None:
             crs = _crs_from_epsg(epsg)
         if crs is not None:
-            import pyproj
-            crs_out = _crs_from_epsg(4326)
-            proj_in = pyproj.Proj(preserve_units=True, **crs)
-            proj_out = pyproj.Proj(preserve_units=True, **crs_out)
-            self.transformfunc = partial(pyproj.transform, proj_in, proj_out)
+            self.transformfunc = _get_transformfunc(crs)
         else:
             self.transformfunc = None
 
+        self.simplify = simplify
+        self.vertices_removed = 0
+
         self._features = []
+        # The [west, south, east, north] bounds of each feature
+        self._bounds = []
+        # The features drawn for each artist, keyed by id(mplobj), and the
+        # ids of the artists not to draw at all
+        self.artist_features = collections.OrderedDict()
+        self.skip_artists = set()
+        # Marker icons shared by the point features, and their ids keyed by
+        # path and style
+        self._icons = []
+        self._icon_ids = {}
+        # Image overlays, see raster.image_overlay()
+        self._images = []
+        # Point features waiting for their offsets to be reprojected. They
+        # are transformed all at once when the figure is closed.
+        self._pending_points = []
+
 
+    def close_figure(self, fig):
+        self._flush_points()
+
+    def _flush_points(self):
+        if not self._pending_points:
+            return
+        features, offsets, indices = zip(*self._pending_points)
+        coords = self.transformfunc(np.array(offsets, dtype=float))
+        for feature, c in zip(features, coords.tolist()):
+            feature['geometry']['coordinates'] = c
+        for i, bounds in zip(indices, np.hstack([coords, coords])):
+            self._bounds[i] = bounds
+        self._pending_points = []
 
     def geojson(self):
+        self._flush_points()
         fc = {
             "type": "FeatureCollection",
             "features": self._features,
         }
+        if self._icons:
+            fc["icons"] = self._icons
+        if self._images:
+            fc["images"] = self._images
         return fc
 
+    def feature_bounds(self):
+        """
+        Return the bounding box of each feature, computed as it was drawn
+
+        Returns
+        -------
+        Array of shape (N, 4) of [west, south, east, north] rows, in the
+        order of the features. Features without coordinates have NaN
+        bounds.
+
+        """
+        self._flush_points()
+        return np.array(self._bounds, dtype=float).reshape(-1, 4)
+
 
     def _convert_style(self, style):
+        # Collections have no alpha of their own
+        alpha = 1 if style['alpha'] is None else style['alpha']
         leaflet_style = {
             'color': style['edgecolor'],
             'weight': style['edgewidth'],
-            'opacity': style['alpha'],
-            'fillOpacity': style['alpha'],
+            'opacity': alpha,
+            'fillOpacity': alpha,
         }
         if style['facecolor'] != 'none':
             leaflet_style['fillColor'] = style['facecolor']
@@ -55,14 +135,15 @@ class LeafletRenderer(Renderer):
         return leaflet_style
 
     def _convert_style_svg(self, style):
+        alpha = 1 if style['alpha'] is None else style['alpha']
         svg_style = {
             'stroke': style['edgecolor'],
             'stroke-width': style['edgewidth'],
-            'stroke-opacity': style['alpha'],
+            'stroke-opacity': alpha,
         }
         if style['facecolor'] != 'none':
             svg_style['fill'] = style['facecolor']
-            svg_style['fill-opacity'] = style['alpha']
+            svg_style['fill-opacity'] = alpha
 
         return svg_style
 
@@ -84,54 +165,56 @@ class LeafletRenderer(Renderer):
         return ' '.join(gen_path_elements(pathcodes, data))
 
 
+    def _add_feature(self, feature, mplobj, positions=None):
+        self._features.append(feature)
+        if positions is None or not len(positions):
+            self._bounds.append(np.full(4, np.nan))
+        else:
+            self._bounds.append(np.concatenate([positions.min(axis=0),
+                                                positions.max(axis=0)]))
+        key = id(mplobj) if mplobj is not None else None
+        self.artist_features.setdefault(key, []).append(feature)
+
+    def _skip(self, mplobj):
+        return mplobj is not None and id(mplobj) in self.skip_artists
+
     def draw_path(self, data, coordinates, pathcodes, style,
                   offset=None, offset_coordinates="data", mplobj=None):
+        if self._skip(mplobj):
+            return
         properties = self._convert_style(style)
         if coordinates == 'points' or coordinates == 'display':
-            # Flip the points about y-axis to align with SVG coordinate
-            # system.
-            path_points = data.copy()
-            path_points[:,1] *= -1
             if offset_coordinates != 'data':
                 pass  # Don't know how to work with this yet
-            if self.transformfunc:
-                coords = self.transformfunc(*offset)
-            else:
-                coords = list(offset)
+            # Reprojected later in one batch with all other markers
+            coords = list(offset)
+            positions = None if self.transformfunc else np.array([coords])
             geometry_type = 'Point'
-
-            # Find the size of the path, and increase by inflation
-            mx = np.max(path_points, axis=0)
-            mn = np.min(path_points, axis=0)
-
-            center = mn + (mx - mn) / 2.0
-            size = np.ceil(_marker_inflation * (mx - mn))
-            corner = center - size / 2.0
-            svg = svg_template.render(
-                path=self._svg_path(pathcodes, path_points),
-                style=self._convert_style_svg(style),
-                width=size[0],
-                height=size[1],
-                minx=corner[0],
-                miny=corner[1],
-            )
-            properties = {'html': svg,
-                          'anchor_x': -corner[0],
-                          'anchor_y': -corner[1]}
+            properties = {'icon': self._marker_icon(data, pathcodes, style)}
         else:
             if self.transformfunc:
-                data = [self.transformfunc(*c) for c in data]
-            else:
-                data = [c.tolist() for c in data]
-            rings = list(iter_rings(data, pathcodes))
+                data = self.transformfunc(data)
+            rings = split_rings(data, pathcodes)
+            if not rings:
+                return
+            positions = np.concatenate(rings)
+            is_polygon = style['facecolor'] != 'none'
+            if self.simplify:
+                rings = [self._simplify_ring(ring, is_polygon)
+                         for ring in rings]
+            rings = [ring.tolist() for ring in rings]
 
-            if style['facecolor'] != 'none':
+            if is_polygon:
                 # It's a polygon
                 geometry_type = 'Polygon'
                 coords = rings
-            else:
+            elif len(rings) == 1:
                 geometry_type = 'LineString'
                 coords = rings[0]
+            else:
+                # e.g. all the lines of one contour level
+                geometry_type = 'MultiLineString'
+                coords = rings
 
         feature = {
             "type": "Feature",
@@ -142,13 +225,244 @@ class LeafletRenderer(Renderer):
             "properties": properties
         }
 
-        self._features.append(feature)
+        if geometry_type == 'Point' and self.transformfunc:
+            self._pending_points.append((feature, offset,
+                                         len(self._features)))
+        self._add_feature(feature, mplobj, positions)
+
+    def draw_markers(self, data, coordinates, style, label, mplobj=None):
+        """
+        Draw all markers of a line as a single MultiPoint feature
+
+        """
+        if self._skip(mplobj):
+            return
+        vertices, pathcodes = style['markerpath']
+        pathstyle = dict((key, style[key]) for key in ['alpha', 'edgecolor',
+                                                       'facecolor', 'zorder',
+                                                       'edgewidth'])
+        pathstyle['dasharray'] = "10,0"
+        icon = self._marker_icon(vertices, pathcodes, pathstyle)
+        self._draw_multipoint(data, icon, mplobj)
+
+    def draw_path_collection(self, paths, path_coordinates, path_transforms,
+                             offsets, offset_coordinates, offset_order,
+                             styles, mplobj=None):
+        """
+        Draw a collection of markers, e.g. a scatter plot, in bulk
+
+        The offsets are grouped by their marker path, transform and colors
+        with NumPy, and each group is drawn as one MultiPoint feature sharing
+        one icon. Collections of paths in data coordinates are drawn path by
+        path with draw_path().
+
+        """
+        if self._skip(mplobj):
+            return
+        mesh = self._quadmesh_image(mplobj)
+        if mesh is not None:
+            rgba, extent = mesh
+            # The face colors already include the collection's alpha
+            self._draw_raster(rgba, extent, None)
+            return
+        if not len(path_transforms):
+            # Recent matplotlib gives no transforms for the paths of e.g.
+            # contours and quivers, rather than the identity
+            path_transforms = [np.eye(3)]
+        n = max(len(paths), len(offsets))
+        if (path_coordinates not in ('points', 'figure', 'display') or
+                offset_order != 'after' or
+                not (len(paths) and len(path_transforms) and len(offsets))):
+            return super(LeafletRenderer, self).draw_path_collection(
+                paths, path_coordinates, path_transforms, offsets,
+                offset_coordinates, offset_order, styles, mplobj)
+
+        def cycle(values):
+            values = np.asarray(values, dtype=float)
+            values = values.reshape(len(values), -1)
+            return values[np.arange(n) % len(values)]
+
+        # One row per element describing everything its icon depends on.
+        # Missing colors are 'none', encoded as -1.
+        columns = [cycle(np.arange(len(paths))),
+                   cycle(path_transforms),
+                   cycle(styles['linewidth'])]
+        for key in ('edgecolor', 'facecolor'):
+            if np.size(styles[key]) == 0:
+                columns.append(np.full((n, 4), -1.0))
+            else:
+                columns.append(cycle(styles[key]))
+        rows = np.hstack(columns)
+        offsets = cycle(offsets)
+
+        # Group the identical rows, in the order np.unique(rows, axis=0)
+        # would give them. That sorts the rows as structured elements, which
+        # is many times slower than a stable lexsort of the columns.
+        order = np.lexsort(rows.T[::-1])
+        rows = rows[order]
+        starts = np.flatnonzero(np.concatenate(
+            [[True], (rows[1:] != rows[:-1]).any(axis=1)]))
+        groups = np.split(offsets[order], starts[1:])
+        for row, group in zip(rows[starts], groups):
+            vertices, pathcodes = paths[int(row[0])]
+            transform = row[1:10].reshape(3, 3)
+            vertices = (np.dot(vertices, transform[:2, :2].T) +
+                        transform[:2, 2])
+            ec, fc = row[11:15], row[15:19]
+            style = {'edgecolor': 'none' if ec[0] < 0 else export_color(ec),
+                     'facecolor': 'none' if fc[0] < 0 else export_color(fc),
+                     'edgewidth': row[10],
+                     'dasharray': "10,0",
+                     'alpha': styles['alpha'],
+                     'zorder': styles['zorder']}
+            icon = self._marker_icon(vertices, pathcodes, style)
+            self._draw_multipoint(group, icon, mplobj)
+
+    def _draw_multipoint(self, data, icon, mplobj=None):
+        data = np.asarray(data, dtype=float).reshape(-1, 2)
+        if self.transformfunc:
+            data = self.transformfunc(data)
+        feature = {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPoint",
+                "coordinates": np.asarray(data).tolist(),
+            },
+            "properties": {'icon': icon},
+        }
+        self._add_feature(feature, mplobj, data)
+
+    def _marker_icon(self, data, pathcodes, style):
+        """
+        Return the id of the icon drawing a marker, creating it if needed
+
+        Identical markers share one icon, so its SVG is only rendered and
+        stored once.
+
+        """
+        svg_style = self._convert_style_svg(style)
+        data = np.ascontiguousarray(data, dtype=float)
+        key = (tuple(pathcodes), data.shape, data.tobytes(),
+               tuple(sorted(svg_style.items())))
+        if key in self._icon_ids:
+            return self._icon_ids[key]
+
+        # Flip the points about y-axis to align with SVG coordinate
+        # system.
+        path_points = data.copy()
+        path_points[:,1] *= -1
+
+        # Find the size of the path, and increase by inflation
+        mx = np.max(path_points, axis=0)
+        mn = np.min(path_points, axis=0)
+
+        center = mn + (mx - mn) / 2.0
+        size = np.ceil(_marker_inflation * (mx - mn))
+        corner = center - size / 2.0
+        svg = render_svg(
+            path=self._svg_path(pathcodes, path_points),
+            style=svg_style,
+            width=size[0],
+            height=size[1],
+            minx=corner[0],
+            miny=corner[1],
+        )
+
+        icon_id = len(self._icons)
+        # The radius and style are used to draw the marker as a circle
+        # instead of the SVG when rendering to a canvas.
+        self._icons.append({'html': svg,
+                            'anchor_x': -corner[0],
+                            'anchor_y': -corner[1],
+                            'radius': np.max(mx - mn) / 2.0,
+                            'style': self._convert_style(style)})
+        self._icon_ids[key] = icon_id
+        return icon_id
+
+    def _simplify_ring(self, ring, is_polygon):
+        simplified = simplify(ring, self.simplify)
+        if is_polygon and len(simplified) < 4:
+            # Don't collapse a polygon ring
+            return ring
+        self.vertices_removed += len(ring) - len(simplified)
+        return simplified
+
+    def draw_image(self, imdata, extent, coordinates, style, mplobj=None):
+        """
+        Draw an image, e.g. from imshow(), as an image overlay
+
+        """
+        from .raster import decode_png, normalize_extent
+
+        if self._skip(mplobj) or coordinates != 'data':
+            return
+        rgba, extent = normalize_extent(decode_png(imdata), extent)
+        self._draw_raster(rgba, extent, style['alpha'])
+
+    def _draw_raster(self, rgba, extent, alpha):
+        from .raster import image_overlay
+
+        self._images.append(image_overlay(rgba, extent, self.transformfunc,
+                                          alpha))
+
+    def _quadmesh_image(self, mplobj):
+        """ Return the pixels and extent of a regular pcolormesh or None """
+        from matplotlib.collections import QuadMesh
+        from .raster import quadmesh_image
+
+        if not isinstance(mplobj, QuadMesh):
+            return None
+        return quadmesh_image(mplobj)
 
     def draw_text(self, *args, **kwargs):
         """ Don't draw the text for now, but don't crash """
         pass
 
 
+_transformfuncs = {}
+
+def _get_transformfunc(crs):
+    """
+    Return a function reprojecting an (N, 2) array from crs to lon/lat.
+
+    The underlying pyproj transformer is built once per distinct crs and
+    reused, and each call transforms the whole array at once. A crs that
+    can't be serialized to JSON, e.g. with numpy values, isn't cached.
+
+    """
+    try:
+        # Values may be lists, e.g. towgs84, so the items aren't hashable
+        key = json.dumps(crs, sort_keys=True)
+    except TypeError:
+        return _make_transformfunc(crs)
+    if key not in _transformfuncs:
+        _transformfuncs[key] = _make_transformfunc(crs)
+    return _transformfuncs[key]
+
+
+def _make_transformfunc(crs):
+    import pyproj
+    crs_out = _crs_from_epsg(4326)
+    if hasattr(pyproj, 'Transformer'):
+        transformer = pyproj.Transformer.from_proj(
+            pyproj.Proj(preserve_units=True, **crs),
+            pyproj.Proj(preserve_units=True, **crs_out),
+            always_xy=True)
+        transform = transformer.transform
+    else:
+        # pyproj < 2.1
+        proj_in = pyproj.Proj(preserve_units=True, **crs)
+        proj_out = pyproj.Proj(preserve_units=True, **crs_out)
+        transform = lambda x, y: pyproj.transform(proj_in, proj_out, x, y)
+
+    def transformfunc(data):
+        data = np.asarray(data, dtype=float)
+        x, y = transform(data[:, 0], data[:, 1])
+        return np.column_stack([x, y])
+
+    return transformfunc
+
+
 def _crs_from_epsg(epsg):
     epsgstr = 'epsg:{}'.format(epsg)
     crs = {'init': epsgstr, 'no_defs': True}
@@ -1,7 +1,36 @@
+import hashlib
+import os
+
 from six import Module_six_moves_urllib as urllib
 
+
+def cache_dir():
+    """
+    Return the directory where downloaded documents are cached
+
+    This is $MPLLEAFLET_CACHE_DIR if set, otherwise mplleaflet under
+    $XDG_CACHE_HOME or ~/.cache.
+
+    """
+    path = os.environ.get('MPLLEAFLET_CACHE_DIR')
+    if path:
+        return path
+    base = (os.environ.get('XDG_CACHE_HOME') or
+            os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'mplleaflet')
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
 class Link(object):
-    def __init__(self, url, download=False):
+    def __init__(self, url, download=False, path=None, sha256=None):
         """Create a link object base on an url.
         Parameters
         ----------
@@ -9,11 +38,80 @@ class Link(object):
                 The url to be linked
             download : bool, default False
                 Whether the target document shall be loaded right now.
+            path : str, default None
+                A local copy of the document, e.g. shipped with the package,
+                used instead of downloading it.
+            sha256 : str, default None
+                The expected SHA-256 hex digest of the document. If given, a
+                local copy or download that doesn't match is rejected.
         """
         self.url = url
+        self.path = path
+        self.sha256 = sha256
         self.code = None
         if download:
-            self.code = urllib.request.urlopen(self.url).read()
+            self.get_code()
+
+    def cache_path(self):
+        """Path of the document in the on-disk cache."""
+        name = os.path.basename(urllib.parse.urlparse(self.url).path)
+        return os.path.join(cache_dir(),
+                            '{}-{}'.format(_sha256(self.url.encode('utf8'))[:16],
+                                           name))
+
+    def get_code(self):
+        """Return the content of the document as bytes.
+
+        The document is looked up, in order, in memory, at self.path, in the
+        on-disk cache, and finally downloaded and added to the cache. Cached
+        copies are stored with their checksum and ignored if they don't
+        match it.
+        """
+        if self.code is None:
+            self.code = self._load()
+        return self.code
+
+    def _load(self):
+        if self.path is not None and os.path.exists(self.path):
+            code = _read(self.path)
+            if self.sha256 is not None and _sha256(code) != self.sha256:
+                raise ValueError('Checksum mismatch for {}'.format(self.path))
+            return code
+
+        cache_path = self.cache_path()
+        checksum_path = cache_path + '.sha256'
+        try:
+            code = _read(cache_path)
+            expected = self.sha256 or _read(checksum_path).decode('ascii')
+            if _sha256(code) == expected.strip():
+                return code
+        except (IOError, OSError):
+            pass
+
+        code = urllib.request.urlopen(self.url).read()
+        checksum = _sha256(code)
+        if self.sha256 is not None and checksum != self.sha256:
+            raise ValueError('Checksum mismatch for {}'.format(self.url))
+
+        # Write to temporary files and rename so concurrent processes
+        # never read a partial file. A cache that can't be written to
+        # is not an error.
+        try:
+            if not os.path.isdir(cache_dir()):
+                os.makedirs(cache_dir())
+            tmp_suffix = '.{}.tmp'.format(os.getpid())
+            for path, data in [(cache_path, code),
+                               (checksum_path, checksum.encode('ascii'))]:
+                with open(path + tmp_suffix, 'wb') as f:
+                    f.write(data)
+                os.replace(path + tmp_suffix, path)
+        except (IOError, OSError):
+            pass
+
+        return code
+
+    def _text(self):
+        return self.get_code().decode('utf8')
 
 class JavascriptLink(Link):
     def render(self, embedded=False):
@@ -25,9 +123,7 @@ class JavascriptLink(Link):
                 Whether the code shall be embedded explicitely in the render.
         """
         if embedded:
-            if self.code is None:
-                self.code = urllib.request.urlopen(self.url).read()
-            return '<script>{}</script>'.format(self.code)
+            return '<script>{}</script>'.format(self._text())
         else:
             return '<script src="{}"></script>'.format(self.url)
 
@@ -41,11 +137,9 @@ class CssLink(Link):
                 Whether the code shall be embedded explicitely in the render.
         """
         if embedded:
-            if self.code is None:
-                self.code = urllib.request.urlopen(self.url).read()
-            return '<style>{}</style>'.format(self.code)
+            return '<style>{}</style>'.format(self._text())
         else:
             return '<link rel="stylesheet" href="{}" />'.format(self.url)
             
 
-            
\ No newline at end of file
+            
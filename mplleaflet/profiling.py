@@ -0,0 +1,202 @@
+"""
+Timings and sizes of the stages of an export
+
+Pass a Profile as the profile argument of fig_to_html(), save_html() or
+fig_to_geojson() to find out where the time of an export goes::
+
+    profile = mplleaflet.Profile()
+    html = mplleaflet.fig_to_html(fig, profile=profile)
+    print(profile.report())
+
+The stages are:
+
+* export: the mplexporter crawl of the figure and the LeafletRenderer
+  drawing its artists. This includes reproject.
+* reproject: the pyproj transformations
+* simplify: simplifying lines and polygons with the simplify argument,
+  also part of export. Its vertices are the vertices removed.
+* encode: JSON encoding of the GeoJSON
+* template: rendering the Jinja2 template around it
+* cache: looking up the output in a RenderCache
+
+"""
+from __future__ import absolute_import
+
+import collections
+import contextlib
+import timeit
+
+_timer = timeit.default_timer
+
+# The Exporter methods drawing one artist, called as method(ax, artist, ...)
+_exporter_methods = ['draw_line', 'draw_patch', 'draw_collection',
+                     'draw_image', 'draw_text']
+
+
+def count_vertices(features):
+    """ Return the number of positions in a list of GeoJSON features """
+    from .utils import map_geojson
+
+    n = [0]
+    def count(coords):
+        if coords and not isinstance(coords[0], list):
+            n[0] += 1  # A Point
+        else:
+            n[0] += len(coords)
+        return coords
+
+    for feature in features:
+        map_geojson(feature, count)
+    return n[0]
+
+
+class Profile(object):
+    """
+    Wall time, features, vertices and bytes of each stage and artist
+
+    Parameters
+    ----------
+    callback : callable, default None
+        Called with to_dict() when the export is done, e.g. to send the
+        measurements to a metrics system
+
+    Attributes
+    ----------
+    seconds : float
+        Wall time of the whole export, once done
+    stages : OrderedDict
+        Measurements keyed by stage name
+    artists : OrderedDict
+        Measurements of the export stage for each artist, keyed by
+        id(artist)
+
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.seconds = None
+        self.stages = collections.OrderedDict()
+        self.artists = collections.OrderedDict()
+        self._start = None
+
+    def _begin(self):
+        if self._start is None:
+            self._start = _timer()
+
+    def add(self, name, seconds, features=0, vertices=0, bytes=0):
+        """ Add measurements to a stage """
+        record = self.stages.setdefault(name, {'seconds': 0., 'features': 0,
+                                               'vertices': 0, 'bytes': 0})
+        record['seconds'] += seconds
+        record['features'] += features
+        record['vertices'] += vertices
+        record['bytes'] += bytes
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """ Context manager timing a stage """
+        self._begin()
+        start = _timer()
+        try:
+            yield
+        finally:
+            self.add(name, _timer() - start)
+
+    def wrap(self, name, func):
+        """ Return func, timing each call as part of a stage """
+        def wrapped(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapped
+
+    def iter_stage(self, name, chunks, count_bytes=True):
+        """ Iterate over chunks of text, timing and counting them """
+        self._begin()
+        it = iter(chunks)
+        while True:
+            start = _timer()
+            try:
+                chunk = next(it)
+            except StopIteration:
+                self.add(name, _timer() - start)
+                return
+            size = len(chunk.encode('utf8')) if count_bytes else 0
+            self.add(name, _timer() - start, bytes=size)
+            yield chunk
+
+    def instrument(self, exporter):
+        """ Time the drawing of each artist by an Exporter """
+        def wrap(method):
+            def wrapped(ax, artist, *args, **kwargs):
+                start = _timer()
+                try:
+                    return method(ax, artist, *args, **kwargs)
+                finally:
+                    record = self.artists.get(id(artist))
+                    if record is None:
+                        label = getattr(artist, 'get_label', lambda: '')()
+                        record = self.artists[id(artist)] = {
+                            'type': type(artist).__name__, 'label': label,
+                            'seconds': 0., 'features': 0, 'vertices': 0}
+                    record['seconds'] += _timer() - start
+            return wrapped
+
+        for name in _exporter_methods:
+            setattr(exporter, name, wrap(getattr(exporter, name)))
+
+    def count(self, renderer):
+        """
+        Record the features and vertices drawn by a LeafletRenderer, and the
+        vertices it removed by simplifying
+
+        """
+        for key, features in renderer.artist_features.items():
+            vertices = count_vertices(features)
+            if key in self.artists:
+                self.artists[key]['features'] += len(features)
+                self.artists[key]['vertices'] += vertices
+            self.add('export', 0., features=len(features), vertices=vertices)
+        if renderer.simplify:
+            self.add('simplify', 0., vertices=renderer.vertices_removed)
+
+    def finish(self):
+        """ Mark the export as done and call the callback """
+        self._begin()
+        self.seconds = _timer() - self._start
+        if self.callback is not None:
+            self.callback(self.to_dict())
+
+    def to_dict(self):
+        """
+        Return the measurements as plain dictionaries and lists
+
+        """
+        artists = []
+        for key, record in self.artists.items():
+            record = dict(record, id=key)
+            artists.append(record)
+        return {
+            'seconds': self.seconds,
+            'stages': dict((k, dict(v)) for k, v in self.stages.items()),
+            'artists': artists,
+        }
+
+    def report(self):
+        """ Return a table of the measurements as a string """
+        lines = ['{:<12} {:>10} {:>10} {:>10} {:>12}'.format(
+            'stage', 'seconds', 'features', 'vertices', 'bytes')]
+        for name, record in self.stages.items():
+            lines.append('{:<12} {:>10.4f} {:>10} {:>10} {:>12}'.format(
+                name, record['seconds'], record['features'],
+                record['vertices'], record['bytes']))
+        if self.seconds is not None:
+            lines.append('{:<12} {:>10.4f}'.format('total', self.seconds))
+        return '\n'.join(lines)
+
+
+def get_profile(profile):
+    """ Resolve a profile argument: a Profile, a callback or None """
+    if profile is None or isinstance(profile, Profile):
+        return profile
+    if callable(profile):
+        return Profile(callback=profile)
+    raise ValueError('profile should be a Profile or a callable')
@@ -0,0 +1,177 @@
+"""
+Georeferenced image overlays for rasters
+
+Images are drawn on the map with Leaflet image overlays rather than as
+GeoJSON. They are inlined in the page, so large images are downsampled to
+at most max_size pixels across. They are also cut into tiles, so the page
+only draws the visible ones.
+
+"""
+from __future__ import absolute_import
+
+import base64
+import io
+
+import numpy as np
+
+_tile_size = 256
+_max_size = 1024
+
+
+def decode_png(data):
+    """ Return a base64 encoded PNG as an (H, W, 4) uint8 array """
+    from matplotlib.image import imread
+
+    rgba = imread(io.BytesIO(base64.b64decode(data)), format='png')
+    if rgba.dtype != np.uint8:
+        rgba = np.round(rgba * 255).astype(np.uint8)
+    if rgba.ndim == 2:
+        rgba = np.dstack([rgba] * 3)
+    if rgba.shape[2] == 3:
+        alpha = np.full(rgba.shape[:2] + (1,), 255, dtype=np.uint8)
+        rgba = np.concatenate([rgba, alpha], axis=2)
+    return rgba
+
+
+def encode_png(rgba):
+    """ Return an (H, W, 4) uint8 array as a PNG data URI """
+    from matplotlib.image import imsave
+
+    f = io.BytesIO()
+    imsave(f, rgba, format='png')
+    return 'data:image/png;base64,' + base64.b64encode(
+        f.getvalue()).decode('ascii')
+
+
+def downsample(rgba):
+    """ Halve the resolution of an image, averaging blocks of 2 x 2 pixels """
+    h, w = rgba.shape[:2]
+    rgba = np.pad(rgba, ((0, h % 2), (0, w % 2), (0, 0)), mode='edge')
+    blocks = rgba.reshape(rgba.shape[0] // 2, 2, rgba.shape[1] // 2, 2, 4)
+    return np.round(blocks.mean(axis=(1, 3))).astype(np.uint8)
+
+
+def _latlng_bounds(west, east, south, north, transformfunc):
+    corners = np.array([[west, south], [west, north],
+                        [east, south], [east, north]], dtype=float)
+    if transformfunc is not None:
+        corners = transformfunc(corners)
+    mn, mx = corners.min(axis=0), corners.max(axis=0)
+    return [[float(mn[1]), float(mn[0])], [float(mx[1]), float(mx[0])]]
+
+
+def _cut(rgba, extent, transformfunc, tile_size):
+    # Returns the tiles of the image, left to right and top to bottom
+    west, east, south, north = extent
+    h, w = rgba.shape[:2]
+    tiles = []
+    for r in range(0, h, tile_size):
+        r1 = min(r + tile_size, h)
+        for c in range(0, w, tile_size):
+            c1 = min(c + tile_size, w)
+            bounds = _latlng_bounds(west + (east - west) * c / w,
+                                    west + (east - west) * c1 / w,
+                                    north - (north - south) * r1 / h,
+                                    north - (north - south) * r / h,
+                                    transformfunc)
+            tiles.append({'url': encode_png(rgba[r:r1, c:c1]),
+                          'bounds': bounds})
+    return tiles
+
+
+def image_overlay(rgba, extent, transformfunc=None, opacity=None,
+                  tile_size=_tile_size, max_size=_max_size):
+    """
+    Return the description of an image overlay for the page
+
+    Parameters
+    ----------
+    rgba : array
+        Array of shape (H, W, 4) of uint8 pixels. The first row is the
+        northern edge.
+    extent : sequence
+        The (west, east, south, north) edges of the image in the figure's
+        coordinates
+    transformfunc : callable, default None
+        Function reprojecting an (N, 2) array of coordinates to lon/lat,
+        e.g. LeafletRenderer.transformfunc. Each tile is placed at the
+        bounding box of its reprojected corners, which is only exact for
+        coordinates aligned with longitude and latitude.
+    opacity : float, default None
+        The opacity of the image, opaque if None
+    tile_size : int, default 256
+        The maximum width and height of the tiles
+    max_size : int, default 1024
+        The maximum width and height of the image. Larger images are
+        downsampled, halving their resolution until they fit, since the
+        tiles are inlined in the page as base64 PNGs.
+
+    Returns
+    -------
+    Dictionary with the "bounds" of the image, its "opacity", its "width"
+    and "height" in pixels and its "tiles", each with a PNG data "url" and
+    its "bounds".
+
+    """
+    while max(rgba.shape[:2]) > max_size:
+        rgba = downsample(rgba)
+    return {
+        'bounds': _latlng_bounds(*extent, transformfunc=transformfunc),
+        'opacity': 1 if opacity is None else opacity,
+        'width': rgba.shape[1],
+        'height': rgba.shape[0],
+        'tiles': _cut(rgba, extent, transformfunc, tile_size),
+    }
+
+
+def normalize_extent(rgba, extent):
+    """
+    Orient an image and its matplotlib extent for image_overlay()
+
+    extent is (left, right, bottom, top), where the first row of rgba is at
+    top. Rows or columns are flipped so that the image runs from west to
+    east and north to south.
+
+    """
+    left, right, bottom, top = extent
+    if right < left:
+        rgba = rgba[:, ::-1]
+        left, right = right, left
+    if top < bottom:
+        rgba = rgba[::-1]
+        bottom, top = top, bottom
+    return rgba, (left, right, bottom, top)
+
+
+def quadmesh_image(mesh):
+    """
+    Return the pixels and extent of a regular QuadMesh, e.g. pcolormesh()
+
+    Returns None if the cells aren't all the same rectangle, or if their
+    edges are drawn.
+
+    """
+    if hasattr(mesh, 'get_coordinates'):
+        coords = mesh.get_coordinates()
+    else:
+        coords = mesh._coordinates
+    coords = np.asarray(coords, dtype=float)
+    ny, nx = coords.shape[0] - 1, coords.shape[1] - 1
+    colors = mesh.get_facecolors()
+    if nx < 1 or ny < 1 or len(colors) != nx * ny:
+        return None
+    if np.size(mesh.get_edgecolors()) and np.any(mesh.get_linewidths()):
+        return None
+
+    x, y = coords[0, :, 0], coords[:, 0, 1]
+    if not (np.allclose(coords[..., 0], x[np.newaxis, :]) and
+            np.allclose(coords[..., 1], y[:, np.newaxis])):
+        return None
+    dx, dy = np.diff(x), np.diff(y)
+    if not (np.allclose(dx, dx[0]) and np.allclose(dy, dy[0])):
+        return None
+
+    rgba = np.round(np.asarray(colors).reshape(ny, nx, 4) * 255)
+    # The first row of the mesh is at y[0], the bottom of the extent
+    return normalize_extent(rgba.astype(np.uint8),
+                            (x[0], x[-1], y[-1], y[0]))
@@ -0,0 +1,275 @@
+"""
+Serve maps of figures over HTTP
+
+show() writes a page and opens it as a file, which doesn't work from a
+remote notebook server. A MapServer instead serves the maps of several
+figures from a small threaded HTTP server. Each map is a page, at
+/<name>/, that loads its GeoJSON from /<name>/data.json. Responses are
+compressed with gzip, or brotli if the brotli package is installed, and
+have an ETag so that unchanged maps are not downloaded again.
+
+"""
+from __future__ import absolute_import
+
+import collections
+import gzip
+import hashlib
+import io
+import re
+import threading
+
+from ._display import (_geojson_params, _new_mapid, _render,
+                       get_template)
+
+_name_re = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _gzip(data):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def _brotli(data):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data)
+
+
+class _Resource(object):
+    """ A response body with its compressed versions and ETag """
+    def __init__(self, body, content_type):
+        self.content_type = content_type
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.bodies = {'identity': body, 'gzip': _gzip(body)}
+        compressed = _brotli(body)
+        if compressed is not None:
+            self.bodies['br'] = compressed
+
+
+def _render_map(fig=None, template='server.html', tiles=None, crs=None,
+                epsg=None, embed_links=False, float_precision=6,
+                simplify=None, canvas=None, canvas_threshold=2000,
+                encoding='json', cull=False):
+    """ Return the page of a map and its GeoJSON as text """
+    from .utils import iterencode_geojson
+
+    fig, renderer = _render(fig, crs=crs, epsg=epsg, simplify=simplify)
+    geojson = renderer.geojson()
+    data = ''.join(iterencode_geojson(geojson, float_precision, encoding))
+
+    dpi = fig.get_dpi()
+    params = _geojson_params(geojson, fig.get_figwidth()*dpi,
+                             fig.get_figheight()*dpi, _new_mapid(), tiles,
+                             embed_links, float_precision, canvas,
+                             canvas_threshold, encoding,
+                             renderer.feature_bounds(), cull)
+    params['data_url'] = 'data.json'
+    html = get_template(template).render(params)
+    return html, data
+
+
+class MapServer(object):
+    """
+    HTTP server of the maps of several figures
+
+    Parameters
+    ----------
+    host : string, default '127.0.0.1'
+        The address to listen on
+    port : int, default 0
+        The port to listen on. 0 picks a free port.
+
+    Other keyword args are the defaults for add().
+
+    """
+    def __init__(self, host='127.0.0.1', port=0, **kwargs):
+        self.defaults = kwargs
+        self._resources = {}
+        self._maps = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._httpd = _make_httpd((host, port), self._get_resource)
+
+    @property
+    def url(self):
+        """ The base url of the server """
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def add(self, fig=None, name=None, **kwargs):
+        """
+        Serve the map of a figure, replacing any map of the same name
+
+        The figure is exported right away. Call add() again to update the
+        map after changing the figure.
+
+        Parameters
+        ----------
+        fig : figure, default gcf()
+            Figure used to convert to map
+        name : string, default 'map<N>'
+            The name of the map in its url. Letters, digits, '_' and '-'.
+
+        See fig_to_html() for description of the other keyword args.
+        Arguments not given default to those passed to MapServer().
+
+        Returns
+        -------
+        The url of the map
+
+        """
+        if name is None:
+            name = 'map{}'.format(len(self._maps))
+        if not _name_re.match(name):
+            raise ValueError('Invalid map name "{}"'.format(name))
+
+        args = dict(self.defaults)
+        args.update(kwargs)
+        html, data = _render_map(fig, **args)
+
+        with self._lock:
+            self._maps[name] = True
+            self._resources['/{}/'.format(name)] = _Resource(
+                html.encode('utf8'), 'text/html; charset=utf-8')
+            self._resources['/{}/data.json'.format(name)] = _Resource(
+                data.encode('utf8'), 'application/json')
+            self._update_index()
+        return self.url + name + '/'
+
+    def remove(self, name):
+        """ Stop serving a map """
+        with self._lock:
+            del self._maps[name]
+            del self._resources['/{}/'.format(name)]
+            del self._resources['/{}/data.json'.format(name)]
+            self._update_index()
+
+    def _update_index(self):
+        links = ''.join('<li><a href="{0}/">{0}</a></li>'.format(name)
+                        for name in self._maps)
+        html = '<html><body><ul>{}</ul></body></html>'.format(links)
+        self._resources['/'] = _Resource(html.encode('utf8'),
+                                         'text/html; charset=utf-8')
+
+    def _get_resource(self, path):
+        with self._lock:
+            return self._resources.get(path)
+
+    def start(self):
+        """ Serve in a background thread. Returns the url of the server """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever)
+            self._thread.daemon = True
+            self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        """ Serve in this thread until interrupted """
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """ Stop serving and close the socket """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def _make_httpd(address, get_resource):
+    """ Return a threaded HTTP server of the resources of get_resource() """
+    # http.server imports email and ssl, so it's only imported once a server
+    # is made rather than with mplleaflet
+    from six.moves import BaseHTTPServer, socketserver
+
+    class HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+        daemon_threads = True
+
+    class Handler(_Handler, BaseHTTPServer.BaseHTTPRequestHandler):
+        pass
+
+    Handler.get_resource = staticmethod(get_resource)
+    return HTTPServer(address, Handler)
+
+
+class _Handler(object):
+    """ Request handling of the MapServer, mixed into a request handler """
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        resource = self.get_resource(path)
+        if resource is None:
+            self.send_error(404)
+            return
+
+        accepted = [e.split(';')[0].strip() for e in
+                    self.headers.get('Accept-Encoding', '').split(',')]
+        encoding = 'identity'
+        for e in ('br', 'gzip'):
+            if e in accepted and e in resource.bodies:
+                encoding = e
+                break
+        body = resource.bodies[encoding]
+
+        # A strong ETag must differ between the encodings of a resource
+        if encoding == 'identity':
+            etag = '"{}"'.format(resource.etag)
+        else:
+            etag = '"{}-{}"'.format(resource.etag, encoding)
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', resource.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(fig=None, host='127.0.0.1', port=8000, open_browser=True,
+          **kwargs):
+    """
+    Serve the map of a figure over HTTP until interrupted
+
+    Parameters
+    ----------
+    fig : figure or list of figures, default gcf()
+        The figures to serve, each as its own map
+    host, port
+        The address to listen on
+    open_browser : bool, default True
+        Whether to open the first map in a browser
+
+    See fig_to_html() for description of the other keyword args.
+
+    """
+    import webbrowser
+
+    server = MapServer(host, port, **kwargs)
+    figs = fig if isinstance(fig, (list, tuple)) else [fig]
+    urls = [server.add(f) for f in figs]
+    print('Serving {} at {}'.format(', '.join(urls), server.url))
+    if open_browser:
+        webbrowser.open(urls[0])
+    server.serve_forever()
@@ -0,0 +1,163 @@
+"""
+Maps of a figure that is updated over time
+
+A MapSession remembers what it last sent for each artist of a figure. Each
+update() only exports the artists that changed since, and returns a diff that
+the session.html page applies to its layers in place.
+
+"""
+from __future__ import absolute_import
+
+import json
+
+from ._display import (_get_fig, _count_layers, _map_params, _new_mapid,
+                       _script_json, get_template)
+
+
+class MapSession(object):
+    """
+    Incrementally export a figure to a Leaflet map
+
+    Artists are compared with their state at the previous update through
+    mplleaflet.cache.artist_hash(). Unchanged artists are not drawn by the
+    renderer nor serialized again.
+
+    A diff is a dictionary with:
+
+    * "update": a list of [key, FeatureCollection] pairs, in drawing order,
+      replacing the features of each artist that is new or changed
+    * "remove": the keys of the artists no longer in the figure
+    * "icons": the marker icons added since the previous diff. Icons are
+      shared by all updates, and features refer to them by index.
+
+    Parameters
+    ----------
+    fig : figure, default gcf()
+        The figure to follow
+    crs, epsg, simplify
+        See fig_to_html()
+    float_precision : int, default 6
+        The number of decimals kept in the coordinates
+
+    """
+    def __init__(self, fig=None, crs=None, epsg=None, simplify=None,
+                 float_precision=6):
+        self.fig = _get_fig(fig)
+        self.crs = crs
+        self.epsg = epsg
+        self.simplify = simplify
+        self.float_precision = float_precision
+        self.mapid = _new_mapid()
+
+        # Hash of each artist when it was last sent, keyed by id(artist)
+        self._hashes = {}
+        # Keys of the artists the page has features for
+        self._sent = set()
+        # Marker icons, shared by the renderers of all the updates
+        self._icons = []
+        self._icon_ids = {}
+        self._icons_sent = 0
+
+    def update(self):
+        """
+        Export the changes to the figure since the previous update
+
+        The first update contains the whole figure.
+
+        Returns
+        -------
+        The diff dictionary
+        """
+        from .cache import artist_hash, iter_artists
+        from .leaflet_renderer import LeafletRenderer
+        from .mplexporter.exporter import Exporter
+        from .utils import round_geojson
+
+        hashes = dict((id(artist), artist_hash(artist))
+                      for artist in iter_artists(self.fig))
+        unchanged = set(key for key, h in hashes.items()
+                        if self._hashes.get(key) == h)
+
+        renderer = LeafletRenderer(crs=self.crs, epsg=self.epsg,
+                                   simplify=self.simplify)
+        renderer._icons = self._icons
+        renderer._icon_ids = self._icon_ids
+        renderer.skip_artists = unchanged
+        Exporter(renderer).run(self.fig)
+        renderer.geojson()
+
+        # Changed artists that no longer draw anything are sent empty
+        features = dict((key, []) for key in hashes
+                        if key not in unchanged and key in self._sent)
+        features.update(renderer.artist_features)
+        order = list(renderer.artist_features)
+        order += [key for key in features if key not in order]
+
+        update = []
+        for key in order:
+            fc = {'type': 'FeatureCollection', 'features': features[key]}
+            update.append([_artist_key(key),
+                           round_geojson(fc, self.float_precision)])
+
+        current = unchanged | set(features)
+        remove = [_artist_key(key) for key in self._sent - current]
+
+        self._hashes = hashes
+        self._sent = set(key for key in current
+                         if features.get(key) or
+                         (key in unchanged and key in self._sent))
+        icons = self._icons[self._icons_sent:]
+        self._icons_sent = len(self._icons)
+
+        return {'update': update, 'remove': remove, 'icons': icons}
+
+    def update_json(self):
+        """ Return the next diff, from update(), encoded as JSON """
+        return json.dumps(self.update())
+
+    def html(self, template='session.html', tiles=None, embed_links=False,
+             canvas=None, canvas_threshold=2000, origin=None):
+        """
+        Return a page showing the current state of the figure
+
+        The page is drawn from a diff of the whole figure, and later diffs
+        apply to it when posted to its window as::
+
+            {"mplleaflet": <session.mapid>, "diff": <diff>}
+
+        e.g. with iframe.contentWindow.postMessage(). Messages are only
+        accepted from the window embedding or opening the page, and from
+        the allowed origin.
+
+        Parameters
+        ----------
+        origin : string, default the page's own origin
+            The origin allowed to post diffs, e.g. 'https://example.com',
+            compared with the message's event.origin. The default suits
+            an iframe with srcdoc, which shares its parent's origin. '*'
+            accepts any origin.
+
+        See fig_to_html() for description of the other keyword args.
+
+        """
+        self._hashes = {}
+        self._sent = set()
+        self._icons_sent = 0
+        diff = self.update()
+
+        if canvas is None:
+            n = sum(_count_layers(fc) for _, fc in diff['update'])
+            canvas = n > canvas_threshold
+
+        dpi = self.fig.get_dpi()
+        params = _map_params(self.fig.get_figwidth()*dpi,
+                             self.fig.get_figheight()*dpi, self.mapid, tiles,
+                             embed_links, canvas)
+        params['diff'] = _script_json(json.dumps(diff))
+        params['origin'] = json.dumps(origin)
+        return get_template(template).render(params)
+
+
+def _artist_key(key):
+    # Not a number, so JavaScript objects keep the keys in insertion order
+    return 'figure' if key is None else 'a{:x}'.format(key)
@@ -0,0 +1,127 @@
+// Frontend of mplleaflet.widget.MapWidget
+//
+// The GeoJSON arrives as a binary buffer of UTF-8 JSON. The map is drawn as
+// soon as it and Leaflet are available, and redrawn in place whenever the
+// Python side replaces the data.
+
+let leaflet = null;
+
+function loadLeaflet(model) {
+  if (window.L) {
+    return Promise.resolve(window.L);
+  }
+  if (leaflet === null) {
+    // Leaflet 0.7 picks its vector renderer when it loads, as base.html
+    // does, so the first widget's choice holds for the page
+    if (model.get('canvas')) {
+      window.L_PREFER_CANVAS = true;
+    }
+    leaflet = new Promise((resolve, reject) => {
+      const script = document.createElement('script');
+      const code = model.get('_leaflet_js_code');
+      if (code) {
+        script.text = code;
+        document.head.appendChild(script);
+        resolve(window.L);
+      } else {
+        script.src = model.get('_leaflet_js_url');
+        script.onload = () => resolve(window.L);
+        script.onerror = reject;
+        document.head.appendChild(script);
+      }
+    });
+  }
+  return leaflet;
+}
+
+function addCss(model) {
+  if (document.getElementById('mplleaflet-css')) {
+    return;
+  }
+  const code = model.get('_leaflet_css_code');
+  let css;
+  if (code) {
+    css = document.createElement('style');
+    css.textContent = code;
+  } else {
+    css = document.createElement('link');
+    css.rel = 'stylesheet';
+    css.href = model.get('_leaflet_css_url');
+  }
+  css.id = 'mplleaflet-css';
+  document.head.appendChild(css);
+}
+
+function layerOptions(L, icons, canvas) {
+  // Markers refer to one of the shared icons by index
+  const divIcons = [];
+  const getIcon = (i) => {
+    if (divIcons[i] === undefined) {
+      const icon = icons[i];
+      divIcons[i] = L.divIcon({html: icon.html,
+        iconAnchor: [icon.anchor_x, icon.anchor_y],
+        className: 'empty'});
+    }
+    return divIcons[i];
+  };
+  return {
+    style: (feature) => feature.properties,
+    pointToLayer: (feature, latlng) => {
+      if (!feature.properties || feature.properties.icon === undefined) {
+        return L.marker(latlng);
+      }
+      if (canvas) {
+        const icon = icons[feature.properties.icon];
+        return L.circleMarker(latlng,
+          L.extend({radius: icon.radius}, icon.style));
+      }
+      return L.marker(latlng, {icon: getIcon(feature.properties.icon)});
+    },
+  };
+}
+
+function render({ model, el }) {
+  const div = document.createElement('div');
+  div.style.height = model.get('height') + 'px';
+  el.appendChild(div);
+  addCss(model);
+
+  let map = null;
+  let layer = null;
+  const draw = () => {
+    const data = model.get('geojson');
+    if (map === null || !data || !data.byteLength) {
+      return;
+    }
+    const gjData = JSON.parse(new TextDecoder().decode(data));
+    const L = window.L;
+    if (layer !== null) {
+      map.removeLayer(layer);
+    }
+    layer = L.geoJson(gjData, layerOptions(L, gjData.icons || [],
+                                           model.get('canvas')));
+    layer.addTo(map);
+    if (gjData.features.length != 0) {
+      map.fitBounds(layer.getBounds());
+    } else {
+      map.setView([0, 0], 1);
+    }
+  };
+
+  loadLeaflet(model).then((L) => {
+    map = L.map(div);
+    L.tileLayer(model.get('tile_url'),
+      {maxZoom: 19, attribution: model.get('attribution')}).addTo(map);
+    draw();
+  });
+  model.on('change:geojson', draw);
+
+  return () => {
+    model.off('change:geojson', draw);
+    if (map !== null) {
+      map.remove();
+    }
+  };
+}
+
+export default { render };
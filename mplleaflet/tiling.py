@@ -0,0 +1,523 @@
+"""
+Export a figure as a pyramid of GeoJSON tiles
+
+Figures too large to embed in one page are cut into z/x/y tiles, using the
+same tiling scheme as the base map, and simplified for each zoom level. The
+tiles are written to a directory next to an index.html that loads only the
+visible tiles, or to a single MBTiles (SQLite) file.
+
+The bounds of the features are also used to index them on a grid, so that a
+single page can only add the features in view.
+
+"""
+from __future__ import absolute_import
+
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+
+import numpy as np
+
+from .utils import GeoJSONEncoder, simplify
+
+# Web Mercator doesn't reach the poles
+_max_lat = 85.0511287798
+
+
+def lonlat_to_tile(lon, lat, zoom):
+    """
+    Return the x, y indices of the tiles containing the given points
+
+    Parameters
+    ----------
+    lon, lat : array_like
+        Longitudes and latitudes in degrees
+    zoom : int
+        The zoom level
+
+    """
+    n = 2 ** zoom
+    lon = np.asarray(lon, dtype=float)
+    lat = np.radians(np.clip(lat, -_max_lat, _max_lat))
+    x = np.floor((lon + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) /
+                 2.0 * n)
+    return (np.clip(x, 0, n - 1).astype(int),
+            np.clip(y, 0, n - 1).astype(int))
+
+
+def _positions(geometry):
+    """ Return all positions of a geometry as one (N, 2) array """
+    coords = geometry['coordinates']
+    if geometry['type'] == 'Point':
+        return np.asarray([coords], dtype=float)
+    if geometry['type'] in ('MultiPoint', 'LineString'):
+        return np.asarray(coords, dtype=float).reshape(-1, 2)
+    if geometry['type'] == 'MultiPolygon':
+        coords = [ring for polygon in coords for ring in polygon]
+    return np.concatenate([np.asarray(ring, dtype=float).reshape(-1, 2)
+                           for ring in coords] or [np.empty((0, 2))])
+
+
+def feature_bounds(features):
+    """
+    Return the bounding box of each feature
+
+    Returns
+    -------
+    Array of shape (N, 4) of [west, south, east, north] rows. Features
+    without coordinates have NaN bounds.
+
+    """
+    bounds = np.full((len(features), 4), np.nan)
+    for i, feature in enumerate(features):
+        positions = _positions(feature['geometry'])
+        if len(positions):
+            bounds[i, :2] = positions.min(axis=0)
+            bounds[i, 2:] = positions.max(axis=0)
+    return bounds
+
+
+def total_bounds(features, bounds=None):
+    """
+    Return the bounds of all features as [[south, west], [north, east]]
+
+    This is the format of a Leaflet LatLngBounds. Returns None if no feature
+    has coordinates. bounds, if given, is the feature_bounds() of features,
+    e.g. from LeafletRenderer.feature_bounds().
+
+    """
+    if bounds is None:
+        bounds = feature_bounds(features)
+    if np.isnan(bounds[:, 0]).all():
+        return None
+    return [[float(np.nanmin(bounds[:, 1])), float(np.nanmin(bounds[:, 0]))],
+            [float(np.nanmax(bounds[:, 3])), float(np.nanmax(bounds[:, 2]))]]
+
+
+def grid_index(bounds, float_precision=6, size=None):
+    """
+    Build a packed grid index of features from their bounds
+
+    The total bounds are cut into size x size cells, and each feature is
+    listed in every cell its bounding box overlaps. The page uses it to only
+    add the features in view.
+
+    Parameters
+    ----------
+    bounds : array_like
+        Array of shape (N, 4) of [west, south, east, north] feature bounds,
+        as returned by feature_bounds()
+    float_precision : int, default 6
+        The number of decimals kept in the bounds
+    size : int, default None
+        The number of cells along each side. By default there are about
+        four features per cell, with at most 64 x 64 cells.
+
+    Returns
+    -------
+    Dictionary with the total "bounds" as [west, south, east, north], the
+    grid "size", the features "boxes" as a flat list of 4 values per
+    feature, and the cell contents in "ids", where the features of cell
+    j * size + i are ids[cells[c]:cells[c + 1]]. Returns None if no feature
+    has coordinates.
+
+    """
+    bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+    ids = np.flatnonzero(~np.isnan(bounds).any(axis=1))
+    if not len(ids):
+        return None
+    valid = bounds[ids]
+    west, south = valid[:, 0].min(), valid[:, 1].min()
+    east, north = valid[:, 2].max(), valid[:, 3].max()
+    if size is None:
+        size = int(np.clip(np.sqrt(len(ids) / 4.), 1, 64))
+    dx = (east - west) / size or 1.
+    dy = (north - south) / size or 1.
+
+    def cell(values, origin, step):
+        return np.clip(np.floor((values - origin) / step), 0,
+                       size - 1).astype(int)
+
+    i0, i1 = cell(valid[:, 0], west, dx), cell(valid[:, 2], west, dx)
+    j0, j1 = cell(valid[:, 1], south, dy), cell(valid[:, 3], south, dy)
+
+    # One entry per feature and cell it overlaps
+    widths = i1 - i0 + 1
+    counts = widths * (j1 - j0 + 1)
+    starts = np.cumsum(counts) - counts
+    k = np.arange(counts.sum()) - np.repeat(starts, counts)
+    cells = ((np.repeat(j0, counts) + k // np.repeat(widths, counts)) * size +
+             np.repeat(i0, counts) + k % np.repeat(widths, counts))
+    order = np.lexsort((np.repeat(ids, counts), cells))
+    offsets = np.searchsorted(cells[order], np.arange(size * size + 1))
+
+    boxes = np.round(np.nan_to_num(bounds), float_precision)
+    return {
+        'bounds': [float(west), float(south), float(east), float(north)],
+        'size': size,
+        'boxes': boxes.ravel().tolist(),
+        'cells': offsets.tolist(),
+        'ids': np.repeat(ids, counts)[order].tolist(),
+    }
+
+
+def _simplify_ring(ring, tolerance, is_polygon):
+    simplified = simplify(ring, tolerance)
+    if is_polygon and len(simplified) < 4:
+        return np.asarray(ring)
+    return simplified
+
+
+def _simplify_geometry(geometry, tolerance):
+    """ Return a copy of a line or polygon geometry simplified """
+    coords = geometry['coordinates']
+    geom_type = geometry['type']
+    if geom_type == 'LineString':
+        coords = _simplify_ring(coords, tolerance, False).tolist()
+    elif geom_type in ('Polygon', 'MultiLineString'):
+        is_polygon = geom_type == 'Polygon'
+        coords = [_simplify_ring(ring, tolerance, is_polygon).tolist()
+                  for ring in coords]
+    elif geom_type == 'MultiPolygon':
+        coords = [[_simplify_ring(ring, tolerance, True).tolist()
+                   for ring in polygon] for polygon in coords]
+    else:
+        return geometry
+    return {'type': geom_type, 'coordinates': coords}
+
+
+def tile_bounds(x, y, zoom):
+    """
+    Return the [west, south, east, north] bounds of a tile in degrees
+
+    The edges of the outer tiles are infinite, as lonlat_to_tile() puts
+    everything beyond them in those tiles.
+
+    """
+    n = 2 ** zoom
+
+    def lat(row):
+        return np.degrees(np.arctan(np.sinh(np.pi * (1 - 2.0 * row / n))))
+
+    return [x / float(n) * 360 - 180 if x > 0 else -np.inf,
+            lat(y + 1) if y < n - 1 else -np.inf,
+            (x + 1) / float(n) * 360 - 180 if x < n - 1 else np.inf,
+            lat(y) if y > 0 else np.inf]
+
+
+def _buffered(box, zoom, fraction):
+    """
+    Grow the box of a tile by a fraction of its size
+
+    Infinite edges stay so. The size of the outer tiles is taken to be
+    their width.
+
+    """
+    west, south, east, north = box
+    width = 360.0 / 2 ** zoom
+    dx = width * fraction
+    dy = (north - south if np.isfinite(north - south) else width) * fraction
+    return [west - dx, south - dy, east + dx, north + dy]
+
+
+def clip_line(points, box):
+    """
+    Clip a line to a box
+
+    The segments are clipped all at once with the Liang-Barsky algorithm.
+
+    Parameters
+    ----------
+    points : array_like
+        A shape (N, 2) array of vertices
+    box : sequence
+        The [west, south, east, north] bounds
+
+    Returns
+    -------
+    List of the (M, 2) arrays of the parts of the line in the box
+
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return []
+    start, d = points[:-1], np.diff(points, axis=0)
+    t0 = np.zeros(len(d))
+    t1 = np.ones(len(d))
+    visible = np.ones(len(d), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in [(-d[:, 0], start[:, 0] - box[0]),
+                     (d[:, 0], box[2] - start[:, 0]),
+                     (-d[:, 1], start[:, 1] - box[1]),
+                     (d[:, 1], box[3] - start[:, 1])]:
+            r = q / p
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+            visible &= (p != 0) | (q >= 0)
+    visible &= t0 <= t1
+    k = np.flatnonzero(visible)
+    if not len(k):
+        return []
+
+    enter = start[k] + t0[k, np.newaxis] * d[k]
+    leave = start[k] + t1[k, np.newaxis] * d[k]
+    # A part goes on through the next segment if it leaves this one at its
+    # end and enters the next one at its start
+    continued = np.zeros(len(k), dtype=bool)
+    continued[1:] = ((k[1:] == k[:-1] + 1) & (t1[k[:-1]] == 1) &
+                     (t0[k[1:]] == 0))
+    starts = np.flatnonzero(~continued)
+    parts = []
+    for i, j in zip(starts, np.append(starts[1:], len(k))):
+        parts.append(np.concatenate([enter[i:i + 1], leave[i:j]]))
+    return parts
+
+
+def clip_ring(ring, box):
+    """
+    Clip a polygon ring to a box with the Sutherland-Hodgman algorithm
+
+    Returns the closed (M, 2) ring, or None if nothing is left. Parts of a
+    concave ring that are cut apart stay joined along the box's edges.
+
+    """
+    ring = np.asarray(ring, dtype=float).reshape(-1, 2)
+    if len(ring) and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    for axis, value, keep_greater in [(0, box[0], True), (0, box[2], False),
+                                      (1, box[1], True), (1, box[3], False)]:
+        if np.isinf(value) or not len(ring):
+            continue
+        following = np.roll(ring, -1, axis=0)
+        if keep_greater:
+            inside = ring[:, axis] >= value
+        else:
+            inside = ring[:, axis] <= value
+        crossing = inside != np.roll(inside, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = ((value - ring[:, axis]) /
+                 (following[:, axis] - ring[:, axis]))[:, np.newaxis]
+            intersection = ring + t * (following - ring)
+        intersection[:, axis] = value
+        # Each vertex if inside, then where the edge from it crosses
+        candidates = np.stack([ring, intersection], axis=1)
+        ring = candidates[np.stack([inside, crossing], axis=1)]
+    if len(ring) < 3:
+        return None
+    return np.concatenate([ring, ring[:1]])
+
+
+def _inside(positions, box):
+    """ Whether the positions are in the box, west and south included """
+    return ((positions[:, 0] >= box[0]) & (positions[:, 0] < box[2]) &
+            (positions[:, 1] >= box[1]) & (positions[:, 1] < box[3]))
+
+
+def _contains(box, positions):
+    return (len(positions) and positions[:, 0].min() >= box[0] and
+            positions[:, 0].max() <= box[2] and
+            positions[:, 1].min() >= box[1] and
+            positions[:, 1].max() <= box[3])
+
+
+def _clip_lines(lines, box):
+    parts = [part.tolist() for line in lines for part in clip_line(line, box)]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return {'type': 'LineString', 'coordinates': parts[0]}
+    return {'type': 'MultiLineString', 'coordinates': parts}
+
+
+def _clip_polygons(polygons, box):
+    clipped = []
+    for polygon in polygons:
+        rings = [clip_ring(ring, box) for ring in polygon]
+        if rings[0] is None:
+            continue
+        clipped.append([ring.tolist() for ring in rings if ring is not None])
+    if not clipped:
+        return None
+    if len(clipped) == 1:
+        return {'type': 'Polygon', 'coordinates': clipped[0]}
+    return {'type': 'MultiPolygon', 'coordinates': clipped}
+
+
+def _clip_feature(feature, box, buffered):
+    """
+    Return the features of the part of a feature in a tile
+
+    Points are kept in the tile they fall in, lines are clipped to the
+    buffered box. A polygon is split into its fill, clipped exactly to the
+    box so that the fills of neighboring tiles don't overlap, and its
+    outline, clipped as lines. Otherwise the edges added by clipping would
+    be stroked.
+
+    """
+    geometry = feature['geometry']
+    geom_type = geometry['type']
+    coords = geometry['coordinates']
+    positions = _positions(geometry)
+    if geom_type in ('Point', 'MultiPoint'):
+        inside = _inside(positions, box)
+        if not inside.any():
+            return []
+        if geom_type == 'MultiPoint' and not inside.all():
+            geometry = {'type': 'MultiPoint',
+                        'coordinates': positions[inside].tolist()}
+        return [dict(feature, geometry=geometry)]
+    if geom_type in ('LineString', 'MultiLineString'):
+        if _contains(buffered, positions):
+            return [feature]
+        lines = [coords] if geom_type == 'LineString' else coords
+        geometry = _clip_lines(lines, buffered)
+        return [dict(feature, geometry=geometry)] if geometry else []
+
+    # A polygon reaching into the buffer is clipped, as the fill of the
+    # next tile covers the buffer too
+    if _contains(box, positions):
+        return [feature]
+    polygons = [coords] if geom_type == 'Polygon' else coords
+    features = []
+    fill = _clip_polygons(polygons, box)
+    properties = feature['properties']
+    if fill is not None and properties.get('fill', True):
+        features.append(dict(feature, geometry=fill, properties=dict(
+            properties, stroke=False)))
+    outline = _clip_lines([ring for polygon in polygons for ring in polygon],
+                          buffered)
+    if outline is not None and properties.get('stroke', True):
+        features.append(dict(feature, geometry=outline, properties=dict(
+            properties, fill=False)))
+    return features
+
+
+# The fraction of a tile's size by which lines extend past its edges, so
+# that they join up with the lines of the next tile
+_tile_buffer = 1 / 64.
+
+
+def iter_tiles(geojson, minzoom=0, maxzoom=12):
+    """
+    Cut a FeatureCollection into tiles
+
+    Each feature is given an 'id', its index in geojson. Features are
+    clipped to the tiles they cross, see _clip_feature(), and each tile
+    is cut from the features of its parent tile, so that the work only
+    grows with the number of non-empty tiles. A feature can have parts in
+    several tiles. Lines and polygons are simplified to about one pixel
+    at each zoom level.
+
+    Yields
+    ------
+    (z, x, y, features) for each non-empty tile
+
+    """
+    features = [{'type': 'Feature', 'id': i, 'geometry': f['geometry'],
+                 'properties': f['properties']}
+                for i, f in enumerate(geojson['features'])
+                if len(_positions(f['geometry']))]
+    # Zoom level 0 is a single tile with everything in it
+    tiles = {(0, 0): features} if features else {}
+
+    for zoom in range(0, maxzoom + 1):
+        if zoom >= minzoom:
+            # One pixel of a 256 pixel tile, in degrees
+            tolerance = 360.0 / 2 ** zoom / 256
+            for (x, y), tile_features in sorted(tiles.items()):
+                yield zoom, x, y, [
+                    dict(f, geometry=_simplify_geometry(f['geometry'],
+                                                        tolerance))
+                    for f in tile_features]
+        if zoom == maxzoom:
+            break
+
+        children = {}
+        for (x, y), tile_features in tiles.items():
+            for cx in (2 * x, 2 * x + 1):
+                for cy in (2 * y, 2 * y + 1):
+                    box = tile_bounds(cx, cy, zoom + 1)
+                    buffered = _buffered(box, zoom + 1, _tile_buffer)
+                    clipped = [part for f in tile_features
+                               for part in _clip_feature(f, box, buffered)]
+                    if clipped:
+                        children[cx, cy] = clipped
+        tiles = children
+
+
+def _encode_tile(features, float_precision):
+    fc = {'type': 'FeatureCollection', 'features': features}
+    return json.dumps(fc, cls=GeoJSONEncoder,
+                      float_precision=float_precision)
+
+
+def write_tile_directory(geojson, path, minzoom=0, maxzoom=12,
+                         float_precision=6):
+    """
+    Write the tiles of a FeatureCollection as path/z/x/y.json files
+
+    The zoom directories already in path are removed first, so that no
+    tile of an earlier export, e.g. one over a larger zoom range, is left.
+
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    for name in os.listdir(path):
+        zoom_dir = os.path.join(path, name)
+        if name.isdigit() and os.path.isdir(zoom_dir):
+            shutil.rmtree(zoom_dir)
+    for z, x, y, features in iter_tiles(geojson, minzoom, maxzoom):
+        tile_dir = os.path.join(path, str(z), str(x))
+        if not os.path.isdir(tile_dir):
+            os.makedirs(tile_dir)
+        with open(os.path.join(tile_dir, '{}.json'.format(y)), 'w') as f:
+            f.write(_encode_tile(features, float_precision))
+
+
+def write_mbtiles(geojson, path, minzoom=0, maxzoom=12, float_precision=6,
+                  name='mplleaflet'):
+    """
+    Write the tiles of a FeatureCollection to an MBTiles (SQLite) file
+
+    Tiles are stored as gzipped GeoJSON. The shared marker icons are stored
+    in the 'icons' metadata entry.
+
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    bounds = feature_bounds(geojson['features'])
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('CREATE TABLE metadata (name text, value text)')
+        conn.execute('CREATE TABLE tiles (zoom_level integer, '
+                     'tile_column integer, tile_row integer, tile_data blob)')
+        conn.execute('CREATE UNIQUE INDEX tile_index ON tiles '
+                     '(zoom_level, tile_column, tile_row)')
+        metadata = {
+            'name': name,
+            'format': 'geojson',
+            'minzoom': str(minzoom),
+            'maxzoom': str(maxzoom),
+            'icons': json.dumps(geojson.get('icons', [])),
+        }
+        if len(bounds) and not np.isnan(bounds[:, 0]).all():
+            metadata['bounds'] = ','.join(str(v) for v in [
+                np.nanmin(bounds[:, 0]), np.nanmin(bounds[:, 1]),
+                np.nanmax(bounds[:, 2]), np.nanmax(bounds[:, 3])])
+        conn.executemany('INSERT INTO metadata VALUES (?, ?)',
+                         sorted(metadata.items()))
+
+        for z, x, y, features in iter_tiles(geojson, minzoom, maxzoom):
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+                f.write(_encode_tile(features, float_precision).encode('utf8'))
+            # MBTiles rows are numbered from the south (TMS)
+            conn.execute('INSERT INTO tiles VALUES (?, ?, ?, ?)',
+                         (z, x, 2 ** z - 1 - y, sqlite3.Binary(buf.getvalue())))
+        conn.commit()
+    finally:
+        conn.close()
@@ -1,11 +1,21 @@
+import base64
 import json
 from json.encoder import JSONEncoder
 
+import numpy as np
+
+_ring_codes = ('M', 'L', 'Z', 'S')
+
 
 def iter_rings(data, pathcodes):
+    """
+    Yield each ring of a path as a list of points, one coordinate at a time.
+
+    This is the reference implementation of split_rings(), which should be
+    preferred for array data.
+
+    """
     ring = []
-    # TODO: Do this smartly by finding when pathcodes changes value and do
-    # smart indexing on data, instead of iterating over each coordinate
     for point, code in zip(data, pathcodes):
         if code == 'M':
             # Emit the path and start a new one
@@ -21,7 +31,280 @@ def iter_rings(data, pathcodes):
         yield ring
 
 
+def split_rings(data, pathcodes):
+    """
+    Split a path into its rings using array slicing.
+
+    Equivalent to iter_rings() but the 'M' boundaries are found with NumPy
+    and each ring is returned as a view into the (N, 2) data array rather
+    than being built up one point at a time.
+
+    Parameters
+    ----------
+    data : array_like
+        A shape (N, 2) array of vertices
+    pathcodes : list
+        The SVG path codes, one per vertex
+
+    Returns
+    -------
+    List of (M, 2) arrays, one per ring
+
+    """
+    data = np.asarray(data)
+    codes = np.asarray(pathcodes)
+    n = min(len(data), len(codes))
+    if n == 0:
+        return []
+    data = data[:n]
+    codes = codes[:n]
+
+    unknown = ~np.isin(codes, _ring_codes)
+    if unknown.any():
+        raise ValueError('Unrecognized code: {}'.format(codes[unknown][0]))
+
+    # Every 'M' starts a new ring. Points before the first 'M' belong to a
+    # ring of their own, as they do in iter_rings().
+    starts = np.flatnonzero(codes == 'M')
+    if len(starts) and starts[0] == 0:
+        starts = starts[1:]
+    return np.split(data, starts)
+
+
+def simplify(points, tolerance):
+    """
+    Simplify a line with the Douglas-Peucker algorithm
+
+    The distances of all points between two kept vertices are computed at
+    once with NumPy. The first and last points are always kept.
+
+    Parameters
+    ----------
+    points : array_like
+        A shape (N, 2) array of vertices
+    tolerance : float
+        The maximum distance, in the units of points, between the original
+        line and the simplified one
+
+    Returns
+    -------
+    The (M, 2) array of the kept vertices, M <= N
+
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n < 3 or not tolerance:
+        return points
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a = points[start]
+        d = points[end] - a
+        rel = points[start+1:end] - a
+        length = np.hypot(d[0], d[1])
+        if length == 0:
+            # Closed ring: use the distance to the start point
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(d[0] * rel[:, 1] - d[1] * rel[:, 0]) / length
+        i = np.argmax(dist)
+        if dist[i] > tolerance:
+            i += start + 1
+            keep[i] = True
+            stack.append((start, i))
+            stack.append((i, end))
+
+    return points[keep]
+
+
+# Nesting depth of the position arrays for each geometry type
+_coordinate_depth = {
+    'Point': 0,
+    'MultiPoint': 1,
+    'LineString': 1,
+    'MultiLineString': 2,
+    'Polygon': 2,
+    'MultiPolygon': 3,
+}
+
+
+def _map_coordinates(coords, depth, func):
+    if depth <= 1:
+        return func(coords)
+    return [_map_coordinates(c, depth - 1, func) for c in coords]
+
+
+def map_geojson(obj, func):
+    """
+    Return a copy of a GeoJSON object with func applied to its coordinates
+
+    func is called with each array of positions, e.g. a LineString's
+    coordinates or one ring of a Polygon, or with the position of a Point.
+    Only the geometries are copied; properties are shared with obj.
+
+    """
+    if not isinstance(obj, dict):
+        return obj
+
+    geom_type = obj.get('type')
+    if geom_type == 'FeatureCollection':
+        obj = dict(obj)
+        obj['features'] = [map_geojson(f, func) for f in obj['features']]
+    elif geom_type == 'Feature':
+        obj = dict(obj)
+        obj['geometry'] = map_geojson(obj['geometry'], func)
+    elif geom_type == 'GeometryCollection':
+        obj = dict(obj)
+        obj['geometries'] = [map_geojson(g, func)
+                             for g in obj['geometries']]
+    elif geom_type in _coordinate_depth:
+        obj = dict(obj)
+        obj['coordinates'] = _map_coordinates(
+            obj['coordinates'], _coordinate_depth[geom_type], func)
+
+    return obj
+
+
+def round_geojson(obj, float_precision):
+    """
+    Return a copy of a GeoJSON object with its coordinates rounded.
+
+    Coordinates are rounded a whole position array at a time with NumPy.
+
+    Parameters
+    ----------
+    obj : dict
+        A GeoJSON FeatureCollection, Feature or geometry
+    float_precision : int
+        The number of decimals to keep
+
+    """
+    def round_positions(coords):
+        coords = np.asarray(coords, dtype=float)
+        return np.round(coords, float_precision).tolist()
+
+    return map_geojson(obj, round_positions)
+
+
+def delta_encode_positions(coords, float_precision):
+    """
+    Encode an array of positions as a string
+
+    The positions are quantized to integers at float_precision, delta
+    encoded along the array, and the little-endian int32 deltas are base64
+    encoded. This is about 3 bytes per number instead of up to 20 for
+    decimal text.
+
+    Raises ValueError if a quantized coordinate or the difference between
+    consecutive ones doesn't fit in an int32, rather than let it wrap
+    around, or if a coordinate isn't finite. Longitudes and latitudes
+    always fit with float_precision up to 6. With 7, consecutive
+    longitudes must be less than about 214 degrees apart.
+
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    # Checked as floats: casting out of range values to integers wraps them
+    quantized = np.round(coords * 10 ** float_precision)
+    deltas = np.concatenate([quantized[:1], np.diff(quantized, axis=0)])
+    limit = 2 ** 31
+    with np.errstate(invalid='ignore'):
+        fits = ((np.abs(quantized) < limit).all() and
+                (np.abs(deltas) < limit).all())
+    if not fits:
+        raise ValueError('Coordinates too large or not finite to delta '
+                         'encode with float_precision={}'.format(
+                             float_precision))
+    data = deltas.astype('<i4').tobytes()
+    return base64.b64encode(data).decode('ascii')
+
+
+def delta_encode_geojson(obj, float_precision):
+    """
+    Return a copy of a GeoJSON object with its coordinates delta encoded.
+
+    Each array of positions is replaced by delta_encode_positions(). Point
+    coordinates are only rounded. The result is not valid GeoJSON until
+    decoded by the templates.
+
+    """
+    def encode_positions(coords):
+        if np.ndim(coords) == 1:
+            return np.round(coords, float_precision).tolist()
+        return delta_encode_positions(coords, float_precision)
+
+    return map_geojson(obj, encode_positions)
+
+
+class GeoJSONEncoder(JSONEncoder):
+    """
+    JSON encoder that limits the precision of GeoJSON coordinates.
+
+    The coordinates are rounded with round_geojson() before encoding, so the
+    standard (C accelerated) encoder does the serialization. The precision
+    is set per instance, e.g.::
+
+        json.dumps(fc, cls=GeoJSONEncoder, float_precision=5)
+
+    With encoding='delta' the coordinates are encoded with
+    delta_encode_geojson() instead.
+
+    """
+    def __init__(self, float_precision=6, encoding='json', **kwargs):
+        super(GeoJSONEncoder, self).__init__(**kwargs)
+        if encoding not in ('json', 'delta'):
+            raise ValueError('Unknown encoding "{}"'.format(encoding))
+        self.float_precision = float_precision
+        self.encoding = encoding
+
+    def iterencode(self, o, _one_shot=False):
+        if self.encoding == 'delta':
+            o = delta_encode_geojson(o, self.float_precision)
+        else:
+            o = round_geojson(o, self.float_precision)
+        return super(GeoJSONEncoder, self).iterencode(o, _one_shot)
+
+
+def iterencode_geojson(fc, float_precision=6, encoding='json'):
+    """
+    Encode a FeatureCollection one feature at a time
+
+    Yields the same text as json.dumps(fc, cls=GeoJSONEncoder) in chunks of
+    at most one feature, so the output can be written out incrementally.
+
+    With encoding='delta' the coordinates are delta encoded and an
+    "encoding" member records the scale needed to decode them.
+
+    """
+    encoder = GeoJSONEncoder(float_precision=float_precision,
+                             encoding=encoding)
+    yield '{"type": "FeatureCollection", "features": ['
+    for i, feature in enumerate(fc['features']):
+        if i:
+            yield ', '
+        yield encoder.encode(feature)
+    yield ']'
+    for key, value in fc.items():
+        if key not in ('type', 'features'):
+            yield ', {}: {}'.format(encoder.encode(key), encoder.encode(value))
+    if encoding == 'delta':
+        yield ', "encoding": {}'.format(encoder.encode(
+            {'type': 'delta', 'scale': 10 ** float_precision}))
+    yield '}'
+
+
 class FloatEncoder(JSONEncoder):
+    """
+    JSON encoder formatting every float with a fixed number of decimals.
+
+    The format is stored on the class and the pure Python encoder is used.
+    Prefer GeoJSONEncoder.
+
+    """
     _formatter = ".3f"
 
     def iterencode(self, o, _one_shot=False):
@@ -0,0 +1,87 @@
+"""
+Jupyter widget showing a figure as a Leaflet map
+
+Requires anywidget. Unlike display(), which embeds the whole page as a
+base64 data URI, the widget sends the GeoJSON once as a binary buffer and
+draws the map as soon as it arrives. Calling update() replaces the data of
+the map in place.
+
+"""
+from __future__ import absolute_import
+
+import os
+
+import anywidget
+import traitlets
+
+from ._display import (_get_fig, _get_tiles, _count_layers, _attribution,
+                       _leaflet_js, _leaflet_css, _static, fig_to_geojson)
+
+
+class MapWidget(anywidget.AnyWidget):
+    """
+    Jupyter widget drawing a figure on a Leaflet map
+
+    Parameters
+    ----------
+    fig : figure, default gcf()
+        Figure used to convert to map
+    height : int, default 60 pixels per inch of figure height
+        The height of the map
+
+    See fig_to_html() for description of the other keyword args.
+
+    """
+    _esm = os.path.join(_static, 'widget.js')
+
+    geojson = traitlets.Bytes(b'').tag(sync=True)
+    tile_url = traitlets.Unicode().tag(sync=True)
+    attribution = traitlets.Unicode().tag(sync=True)
+    height = traitlets.Int(480).tag(sync=True)
+    canvas = traitlets.Bool(False).tag(sync=True)
+    _leaflet_js_url = traitlets.Unicode(_leaflet_js.url).tag(sync=True)
+    _leaflet_css_url = traitlets.Unicode(_leaflet_css.url).tag(sync=True)
+    _leaflet_js_code = traitlets.Unicode().tag(sync=True)
+    _leaflet_css_code = traitlets.Unicode().tag(sync=True)
+
+    def __init__(self, fig=None, height=None, tiles=None, crs=None,
+                 epsg=None, embed_links=False, float_precision=6,
+                 simplify=None, canvas=None, canvas_threshold=2000):
+        fig = _get_fig(fig)
+        tiles = _get_tiles(tiles)
+        if height is None:
+            height = int(60. * fig.get_figheight())
+        super(MapWidget, self).__init__(
+            tile_url=tiles[0], attribution=_attribution + ' | ' + tiles[1],
+            height=height)
+        if embed_links:
+            self._leaflet_js_code = _leaflet_js._text()
+            self._leaflet_css_code = _leaflet_css._text()
+
+        self.fig = fig
+        self._render_kwargs = {'crs': crs, 'epsg': epsg, 'simplify': simplify}
+        self._float_precision = float_precision
+        self._canvas = canvas
+        self._canvas_threshold = canvas_threshold
+        self.update()
+
+    def update(self, fig=None):
+        """
+        Replace the map's data with that of fig
+
+        fig defaults to the widget's figure, which display() may already
+        have closed. Passing another figure makes it the widget's figure.
+
+        """
+        from .utils import iterencode_geojson
+
+        if fig is not None:
+            self.fig = fig
+        geojson = fig_to_geojson(self.fig, **self._render_kwargs)
+        canvas = self._canvas
+        if canvas is None:
+            canvas = _count_layers(geojson) > self._canvas_threshold
+        text = ''.join(iterencode_geojson(geojson, self._float_precision))
+        with self.hold_sync():
+            self.canvas = canvas
+            self.geojson = text.encode('utf8')
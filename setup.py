@@ -30,9 +30,15 @@ setup(
     download_url=DOWNLOAD_URL,
     license=LICENSE,
     packages=find_packages(),
-    package_data={'': ['*.html']}, # Include the templates
+    package_data={'': ['*.html', 'static/*']}, # Include the templates
     install_requires=[
         "jinja2",
         "six",
     ],
+    extras_require={
+        'widget': ["anywidget"],
+    },
+    entry_points={
+        'console_scripts': ['mplleaflet = mplleaflet.cli:main'],
+    },
 )
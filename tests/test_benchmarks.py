@@ -0,0 +1,292 @@
+"""
+Benchmarks for the hot paths of the export pipeline.
+
+These are skipped unless the MPLLEAFLET_BENCHMARK environment variable is
+set, e.g.::
+
+    MPLLEAFLET_BENCHMARK=1 py.test -s tests/test_benchmarks.py
+
+If MPLLEAFLET_BENCHMARK_OUTPUT is also set, every report is appended to that
+file as a line of JSON, to compare runs.
+
+"""
+import json
+import os
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.patches import Polygon
+import numpy as np
+import pytest
+
+import mplleaflet
+from mplleaflet._display import _iter_geojson_html
+from mplleaflet.leaflet_renderer import LeafletRenderer
+from mplleaflet.mplexporter.exporter import Exporter
+from mplleaflet.profiling import Profile
+from mplleaflet.utils import (FloatEncoder, GeoJSONEncoder, iter_rings,
+                              split_rings)
+
+pytestmark = pytest.mark.skipif(not os.environ.get('MPLLEAFLET_BENCHMARK'),
+                                reason='set MPLLEAFLET_BENCHMARK to run')
+
+
+def best_of(func, repeat=3):
+    """ Return the best wall time of several calls to func() """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def report(name, **values):
+    """ Print timings, given as floats in seconds, and integer sizes """
+    def format_value(v):
+        if isinstance(v, float):
+            return '{:.4f}s'.format(v)
+        return '{:,}'.format(v)
+
+    print('\n{}: {}'.format(name, ', '.join(
+        '{}={}'.format(k, format_value(v)) for k, v in sorted(values.items()))))
+    output = os.environ.get('MPLLEAFLET_BENCHMARK_OUTPUT')
+    if output:
+        with open(output, 'a') as f:
+            f.write(json.dumps(dict(values, name=name)) + '\n')
+
+
+def make_path(n_vertices, ring_size=1000):
+    rs = np.random.RandomState(0)
+    data = rs.uniform(-180, 180, size=(n_vertices, 2))
+    pathcodes = ['L'] * n_vertices
+    pathcodes[::ring_size] = ['M'] * len(pathcodes[::ring_size])
+    return data, pathcodes
+
+
+@pytest.mark.parametrize('n_vertices', [10000, 1000000])
+def test_bench_rings(n_vertices):
+    data, pathcodes = make_path(n_vertices)
+
+    def loop():
+        return [[c.tolist() for c in ring]
+                for ring in iter_rings(data, pathcodes)]
+
+    def vectorized():
+        return [ring.tolist() for ring in split_rings(data, pathcodes)]
+
+    assert loop() == vectorized()
+    report('rings n={}'.format(n_vertices),
+           iter_rings=best_of(loop), split_rings=best_of(vectorized))
+
+
+def make_feature_collection(n_vertices, ring_size=1000):
+    data, pathcodes = make_path(n_vertices, ring_size)
+    features = [{
+        'type': 'Feature',
+        'geometry': {'type': 'LineString', 'coordinates': ring.tolist()},
+        'properties': {'color': '#0000FF', 'weight': 1.0, 'opacity': 1},
+    } for ring in split_rings(data, pathcodes)]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def test_bench_encoder():
+    fc = make_feature_collection(1000000)
+
+    def float_encoder():
+        FloatEncoder._formatter = '.6f'
+        return json.dumps(fc, cls=FloatEncoder)
+
+    def geojson_encoder():
+        return json.dumps(fc, cls=GeoJSONEncoder, float_precision=6)
+
+    old = json.loads(float_encoder())
+    new = json.loads(geojson_encoder())
+    np.testing.assert_allclose(
+        old['features'][0]['geometry']['coordinates'],
+        new['features'][0]['geometry']['coordinates'])
+    report('encode 1M vertices', FloatEncoder=best_of(float_encoder),
+           GeoJSONEncoder=best_of(geojson_encoder))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='needs -X importtime')
+def test_bench_import_time():
+    def import_time():
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import mplleaflet'],
+            stderr=subprocess.STDOUT, universal_newlines=True)
+        # The cumulative time, in microseconds, of the top-level package
+        line = [l for l in output.splitlines() if l.endswith('| mplleaflet')]
+        return int(line[0].split('|')[1]) / 1e6
+
+    report('import mplleaflet', cumulative=min(import_time()
+                                               for _ in range(5)))
+
+
+# Synthetic figures at several scales. The projected ones are in EPSG:26986
+# (Mass. state plane), as in examples/quiver.py.
+_crs = {'init': 'epsg:26986', 'no_defs': True}
+_x0, _y0 = 230000., 900000.
+
+
+def make_lines(scale):
+    rs = np.random.RandomState(0)
+    fig, ax = plt.subplots()
+    for _ in range(2 * scale):
+        xy = np.cumsum(rs.normal(scale=100, size=(1000, 2)), axis=0)
+        ax.plot(_x0 + xy[:, 0], _y0 + xy[:, 1])
+    return fig
+
+
+def make_polygons(scale):
+    rs = np.random.RandomState(0)
+    fig, ax = plt.subplots()
+    angles = np.linspace(0, 2 * np.pi, 50)
+    circle = np.column_stack([np.cos(angles), np.sin(angles)])
+    for _ in range(20 * scale):
+        center = rs.uniform(0, 100000, size=2) + [_x0, _y0]
+        ax.add_patch(Polygon(center + rs.uniform(500, 5000) * circle,
+                             facecolor=rs.uniform(size=3)))
+    ax.autoscale_view()
+    return fig
+
+
+def make_contour(scale):
+    # Like examples/contour.py: contours of a gridded field in projected
+    # coordinates
+    n = int(100 * np.sqrt(scale))
+    x = _x0 + np.linspace(0, 100000, n)
+    y = _y0 + np.linspace(0, 100000, n)
+    X, Y = np.meshgrid(x, y)
+    Z = (np.sin((X - _x0) / 7000.) * np.cos((Y - _y0) / 9000.) +
+         (X - _x0) / 100000.)
+    fig, ax = plt.subplots()
+    ax.contour(X, Y, Z, 20)
+    return fig
+
+
+def make_quiver(scale):
+    # Like examples/quiver.py: arrows colored by speed
+    rs = np.random.RandomState(0)
+    n = 200 * scale
+    xy = rs.uniform(0, 100000, size=(n, 2)) + [_x0, _y0]
+    speed = rs.uniform(0, 10, size=n)
+    angle = rs.uniform(0, 2 * np.pi, size=n)
+    fig, ax = plt.subplots()
+    ax.quiver(xy[:, 0], xy[:, 1], np.cos(angle), np.sin(angle), speed)
+    return fig
+
+
+def make_scatter(scale):
+    rs = np.random.RandomState(0)
+    n = 2000 * scale
+    xy = rs.uniform(0, 100000, size=(n, 2)) + [_x0, _y0]
+    fig, ax = plt.subplots()
+    ax.scatter(xy[:, 0], xy[:, 1], c=rs.randint(0, 5, size=n), s=10)
+    return fig
+
+
+# The LeafletRenderer methods timed as the draw stage. Markers are
+# reprojected when the figure is closed.
+_draw_methods = ['draw_path', 'draw_markers', 'draw_path_collection',
+                 'draw_image', 'close_figure']
+
+
+def profile_pipeline(fig):
+    """
+    Run the stages of fig_to_html() with each one timed by a Profile
+
+    The stages are nested: export includes draw, which includes reproject.
+
+    """
+    profile = Profile()
+    renderer = LeafletRenderer(crs=_crs)
+    renderer.transformfunc = profile.wrap('reproject', renderer.transformfunc)
+    for name in _draw_methods:
+        setattr(renderer, name, profile.wrap('draw', getattr(renderer, name)))
+    with profile.stage('export'):
+        Exporter(renderer).run(fig)
+    html = ''.join(_iter_geojson_html(renderer.geojson(),
+                                      bounds=renderer.feature_bounds(),
+                                      profile=profile))
+    return profile, renderer, html
+
+
+def peak_memory(func):
+    """ Return the peak memory, in bytes, allocated while calling func() """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('scale', [1, 10, 100])
+@pytest.mark.parametrize('make_figure', [make_lines, make_polygons,
+                                         make_contour, make_quiver,
+                                         make_scatter])
+def test_bench_pipeline(make_figure, scale):
+    """
+    Time each stage of fig_to_html() separately
+
+    Each stage is timed directly, in the fastest of three runs. crawl is
+    the Exporter outside of the renderer's draw methods, draw the
+    LeafletRenderer without reprojection, reproject the pyproj
+    transformations, encode the JSON encoding and template the page around
+    the GeoJSON.
+
+    """
+    fig = make_figure(scale)
+    runs = [profile_pipeline(fig) for _ in range(3)]
+    profile, renderer, html = min(runs, key=lambda run: run[0].seconds)
+    memory = peak_memory(lambda: mplleaflet.fig_to_html(fig, crs=_crs))
+    plt.close(fig)
+
+    seconds = dict((name, record['seconds'])
+                   for name, record in profile.stages.items())
+    report('{} scale={}'.format(make_figure.__name__[5:], scale),
+           crawl=seconds['export'] - seconds['draw'],
+           draw=seconds['draw'] - seconds['reproject'],
+           reproject=seconds['reproject'], encode=seconds['encode'],
+           template=seconds['template'], total=profile.seconds,
+           features=len(renderer.geojson()['features']),
+           peak_memory=memory, output_bytes=len(html.encode('utf8')))
+
+
+def test_bench_templates(tmpdir):
+    """
+    Time the template overhead of small maps
+
+    first is loading the page template in a new Environment, with and
+    without a warm bytecode cache, page rendering an empty map with the
+    loaded template and markers the SVG of 1000 marker icons.
+
+    """
+    from mplleaflet import _display
+    from mplleaflet.leaflet_renderer import render_svg
+
+    def load(directory=None):
+        _display._env = None
+        _display._templates.clear()
+        if directory:
+            os.environ['MPLLEAFLET_TEMPLATE_CACHE'] = directory
+        try:
+            _display.get_template('base.html')
+        finally:
+            os.environ.pop('MPLLEAFLET_TEMPLATE_CACHE', None)
+
+    load(str(tmpdir))
+    first = best_of(load, repeat=5)
+    first_cached = best_of(lambda: load(str(tmpdir)), repeat=5)
+    load()
+
+    empty = {'type': 'FeatureCollection', 'features': []}
+    page = best_of(lambda: ''.join(_iter_geojson_html(empty)), repeat=20)
+    style = {'stroke': '#0000FF', 'stroke-width': 1.0, 'stroke-opacity': 1}
+    markers = best_of(lambda: [render_svg('M 0.0 -3.0 L 3.0 0.0 Z', style,
+                                         8., 8., -4., -4.)
+                              for _ in range(1000)])
+
+    report('templates', first=first, first_cached=first_cached, page=page,
+           markers=markers)
@@ -1,5 +1,23 @@
+import base64
+import json
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+
 import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
 import mplleaflet
+from mplleaflet import cli
+from mplleaflet.leaflet_renderer import LeafletRenderer
+from mplleaflet.links import JavascriptLink
+from mplleaflet.mplexporter.exporter import Exporter
+from mplleaflet.utils import (GeoJSONEncoder, delta_encode_positions,
+                              iter_rings, iterencode_geojson, simplify,
+                              split_rings)
 
 def test_basic():
     plt.plot([0, 1], [0, 1])
@@ -14,3 +32,922 @@ def test_basic_tiles():
 def test_scatter():
     plt.scatter([0, 10, 0, 10], [0, 0, 10, 10], c=[1, 2, 3, 4])
     mplleaflet.fig_to_html()
+
+
+def test_split_rings_matches_iter_rings():
+    data = np.arange(20, dtype=float).reshape(10, 2)
+    pathcodes = ['L', 'M', 'L', 'L', 'Z', 'M', 'M', 'L', 'S', 'L']
+    expected = [[p.tolist() for p in ring]
+                for ring in iter_rings(data, pathcodes)]
+    result = [ring.tolist() for ring in split_rings(data, pathcodes)]
+    assert result == expected
+
+
+def test_split_rings_bad_code():
+    with pytest.raises(ValueError):
+        split_rings(np.zeros((2, 2)), ['M', 'C'])
+
+
+def test_crs_transform():
+    pyproj = pytest.importorskip('pyproj')
+    # Two points in Massachusetts state plane, as a line and as markers
+    x = [236000., 237000.]
+    y = [900000., 901000.]
+    plt.figure()
+    plt.plot(x, y, 'r-')
+    plt.plot(x, y, 'bo')
+    gj = mplleaflet.fig_to_geojson(epsg=26986)
+
+    transformer = pyproj.Transformer.from_crs('epsg:26986', 'epsg:4326',
+                                              always_xy=True)
+    expected = np.column_stack(transformer.transform(x, y))
+    line, points = gj['features']
+    assert line['geometry']['type'] == 'LineString'
+    np.testing.assert_allclose(line['geometry']['coordinates'], expected)
+    assert points['geometry']['type'] == 'MultiPoint'
+    np.testing.assert_allclose(points['geometry']['coordinates'], expected)
+
+
+def test_crs_with_list_values():
+    pytest.importorskip('pyproj')
+    from mplleaflet.leaflet_renderer import _get_transformfunc
+
+    # towgs84 is a list, so the crs can't be keyed on its items
+    crs = {'proj': 'utm', 'zone': 18, 'ellps': 'intl', 'units': 'm',
+           'towgs84': [-87, -98, -121, 0, 0, 0, 0], 'no_defs': True}
+    transformfunc = _get_transformfunc(crs)
+    assert _get_transformfunc(dict(crs)) is transformfunc
+    lon, lat = transformfunc([[500000., 4500000.]])[0]
+    assert abs(lon + 75) < 0.01 and 40 < lat < 41
+
+
+def test_geojson_encoder_precision():
+    fc = {
+        'type': 'FeatureCollection',
+        'features': [{
+            'type': 'Feature',
+            'geometry': {'type': 'LineString',
+                         'coordinates': [[1.23456789, 2.0], [3.0, -4.5678]]},
+            'properties': {'weight': 1.0},
+        }],
+    }
+    coords = lambda s: json.loads(s)['features'][0]['geometry']['coordinates']
+    assert coords(json.dumps(fc, cls=GeoJSONEncoder, float_precision=2)) == \
+        [[1.23, 2.0], [3.0, -4.57]]
+    assert coords(json.dumps(fc, cls=GeoJSONEncoder, float_precision=4)) == \
+        [[1.2346, 2.0], [3.0, -4.5678]]
+    # The input is left untouched
+    assert fc['features'][0]['geometry']['coordinates'][0][0] == 1.23456789
+
+
+def test_iterencode_geojson():
+    plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    plt.plot([0, 1, 2], [0, 1, 0], 'rs')
+    gj = mplleaflet.fig_to_geojson()
+    gj['bbox'] = [0, 0, 2, 1]
+    chunks = list(iterencode_geojson(gj, 4))
+    assert len(chunks) > 4
+    assert ''.join(chunks) == json.dumps(gj, cls=GeoJSONEncoder,
+                                         float_precision=4)
+
+
+def test_save_html(tmpdir):
+    plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    path = str(tmpdir.join('map.html'))
+    mplleaflet.save_html(fileobj=path)
+    with open(path) as f:
+        html = f.read()
+    assert 'var gjData = {"type": "FeatureCollection"' in html
+    assert '__mplleaflet_geojson' not in html
+
+    # A failure while writing leaves the previous file and closes the file
+    fig = plt.figure()
+    plt.plot([-179, 179], [0, 0])
+    with pytest.raises(ValueError):
+        mplleaflet.save_html(fig, fileobj=path, encoding='delta',
+                             float_precision=7)
+    with open(path) as f:
+        assert f.read() == html
+    assert tmpdir.listdir() == [tmpdir.join('map.html')]
+    f = open(str(tmpdir.join('other.html')), 'w')
+    with pytest.raises(ValueError):
+        mplleaflet.save_html(fig, fileobj=f, encoding='delta',
+                             float_precision=7)
+    assert f.closed
+
+
+def test_save_geojson(tmpdir):
+    plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    expected = mplleaflet.fig_to_geojson(plt.gcf())
+    path = str(tmpdir.join('map.geojson'))
+    plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    mplleaflet.save_geojson(fileobj=path)
+    with open(path) as f:
+        assert json.load(f) == expected
+
+
+def test_simplify():
+    x = np.linspace(0, 10, 101)
+    line = np.column_stack([x, 0.001 * np.sin(x)])
+    line[50, 1] = 1.0
+    result = simplify(line, 0.01)
+    # Only the spike and the ends survive
+    assert result.tolist() == line[[0, 49, 50, 51, 100]].tolist()
+    # A tolerance of 0 keeps everything
+    assert len(simplify(line, 0)) == 101
+
+
+def test_renderer_simplify():
+    x = np.linspace(0, 10, 1001)
+    fig = plt.figure()
+    plt.plot(x, 0.0001 * np.sin(x), 'b-')
+    renderer = LeafletRenderer(simplify=0.01)
+    Exporter(renderer).run(fig)
+    coords = renderer.geojson()['features'][0]['geometry']['coordinates']
+    assert len(coords) == 2
+    assert renderer.vertices_removed == 999
+
+    # The count is reported by the profile of the public functions
+    profile = mplleaflet.Profile()
+    mplleaflet.fig_to_html(fig, simplify=0.01, profile=profile)
+    assert profile.stages['simplify']['vertices'] == 999
+    assert profile.stages['export']['vertices'] == 2
+    assert 'simplify' in profile.report()
+
+
+def test_marker_icons_shared():
+    plt.figure()
+    plt.plot([0, 1, 2, 3], [0, 1, 0, 1], 'rs')
+    plt.plot([0, 1], [1, 0], 'bo')
+    gj = mplleaflet.fig_to_geojson()
+    assert [f['properties']['icon'] for f in gj['features']] == [0, 1]
+    assert len(gj['icons']) == 2
+    assert gj['icons'][0]['html'].startswith('<svg')
+
+
+def test_scatter_multipoint():
+    x = np.arange(10.)
+    plt.figure()
+    plt.scatter(x, x, c=x % 2)
+    gj = mplleaflet.fig_to_geojson()
+    # One MultiPoint per color
+    assert len(gj['features']) == 2
+    assert len(gj['icons']) == 2
+    coords = sorted(c for f in gj['features']
+                    for c in f['geometry']['coordinates'])
+    assert coords == np.column_stack([x, x]).tolist()
+
+
+def test_canvas():
+    plt.figure()
+    plt.plot(np.arange(10), np.arange(10), 'ro')
+    assert 'L_PREFER_CANVAS' not in mplleaflet.fig_to_html()
+    plt.figure()
+    plt.plot(np.arange(10), np.arange(10), 'ro')
+    assert 'L_PREFER_CANVAS' in mplleaflet.fig_to_html(canvas=True)
+    plt.figure()
+    plt.plot(np.arange(10), np.arange(10), 'ro')
+    html = mplleaflet.fig_to_html(canvas_threshold=5)
+    assert 'L_PREFER_CANVAS' in html
+    assert 'L.circleMarker' in html
+
+
+def test_canvas_scatter_style():
+    # Collections have no alpha, which mustn't make the circles transparent
+    fig, ax = plt.subplots()
+    ax.scatter([0, 1], [0, 1])
+    geojson = mplleaflet.fig_to_geojson(fig)
+    assert 'null' not in mplleaflet.fig_to_html(fig, canvas=True)
+    plt.close(fig)
+    style = geojson['icons'][0]['style']
+    assert style['opacity'] == 1
+    assert style['fillOpacity'] == 1
+    assert 'opacity="None"' not in geojson['icons'][0]['html']
+
+
+def test_save_tiles(tmpdir):
+    x = np.linspace(5, 10, 200)
+    fig = plt.figure()
+    plt.plot(x, x, 'b-')
+    plt.plot([-5, -6], [-5, -6], 'ro')
+    path = str(tmpdir.join('tiles'))
+    mplleaflet.save_tiles(fig, path=path, minzoom=0, maxzoom=3)
+
+    with open(os.path.join(path, 'index.html')) as f:
+        assert 'loadTile' in f.read()
+    with open(os.path.join(path, '0', '0', '0.json')) as f:
+        tile = json.load(f)
+    assert [feat['id'] for feat in tile['features']] == [0, 1]
+    # The line is in the north east tile and the markers in the south west
+    # one at zoom level 1
+    assert sorted(os.listdir(os.path.join(path, '1'))) == ['0', '1']
+    assert os.listdir(os.path.join(path, '1', '0')) == ['1.json']
+    assert os.listdir(os.path.join(path, '1', '1')) == ['0.json']
+    with open(os.path.join(path, '1', '1', '0.json')) as f:
+        line = json.load(f)['features'][0]
+    # Simplified to its end points
+    assert line['geometry']['coordinates'] == [[5, 5], [10, 10]]
+
+    # The tiles of a larger zoom range aren't left behind
+    mplleaflet.save_tiles(fig, path=path, minzoom=0, maxzoom=1)
+    assert sorted(os.listdir(path)) == ['0', '1', 'index.html']
+
+
+def test_tiles_are_clipped():
+    from mplleaflet.tiling import iter_tiles, tile_bounds
+
+    line = np.column_stack([np.linspace(-170, 170, 1000),
+                            np.linspace(-60, 60, 1000)])
+    square = [[-100, -50], [100, -50], [100, 50], [-100, 50], [-100, -50]]
+    geojson = {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {},
+         'geometry': {'type': 'LineString', 'coordinates': line.tolist()}},
+        {'type': 'Feature', 'properties': {'color': 'red'},
+         'geometry': {'type': 'Polygon', 'coordinates': [square]}}]}
+
+    tiles = [t for t in iter_tiles(geojson, 4, 4)]
+    # The line only crosses a few of the tiles of its bounding box
+    line_tiles = [t for t in tiles if any(f['id'] == 0 for f in t[3])]
+    assert len(line_tiles) < 40
+    for z, x, y, features in line_tiles:
+        west, south, east, north = tile_bounds(x, y, z)
+        coords, = [np.array(f['geometry']['coordinates']) for f in features
+                   if f['id'] == 0]
+        assert coords[:, 0].min() > west - 1
+        assert coords[:, 0].max() < east + 1
+
+    # Inside the square, its fill is the tile and its outline is left out
+    z, x, y, features = [t for t in tiles if t[1:3] == (6, 6)][0]
+    fill, = features
+    assert fill['properties'] == {'color': 'red', 'stroke': False}
+    np.testing.assert_allclose(
+        np.array(fill['geometry']['coordinates'][0]).min(axis=0),
+        tile_bounds(6, 6, 4)[:2])
+
+    # A polygon only reaching into a tile's buffer is clipped to the tile,
+    # so that the fills of neighboring tiles don't overlap
+    west, south, east, north = tile_bounds(1, 1, 2)
+    small = [[west + 1, south + 1], [east + 0.01, south + 1],
+             [east + 0.01, north - 1], [west + 1, south + 1]]
+    geojson['features'] = [{'type': 'Feature', 'properties': {},
+                            'geometry': {'type': 'Polygon',
+                                         'coordinates': [small]}}]
+    tiles = dict(((x, y), features)
+                 for z, x, y, features in iter_tiles(geojson, 2, 2))
+    for x, y in [(1, 1), (2, 1)]:
+        west, south, east, north = tile_bounds(x, y, 2)
+        fill, = [f for f in tiles[x, y] if f['properties'].get('fill', True)]
+        lons = np.array(fill['geometry']['coordinates'][0])[:, 0]
+        assert lons.min() >= west - 1e-9 and lons.max() <= east + 1e-9
+
+
+def test_save_mbtiles(tmpdir):
+    plt.figure()
+    plt.plot([5, 10], [5, 10], 'b-')
+    path = str(tmpdir.join('map.mbtiles'))
+    mplleaflet.save_tiles(path=path, maxzoom=1)
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT zoom_level, tile_column, tile_row '
+                        'FROM tiles ORDER BY 1, 2, 3').fetchall()
+    conn.close()
+    assert rows == [(0, 0, 0), (1, 1, 1)]
+
+
+def test_delta_encode_positions():
+    coords = [[-71.123456, 42.5], [-71.123, 42.499999], [180, -90]]
+    encoded = delta_encode_positions(coords, 6)
+    deltas = np.frombuffer(base64.b64decode(encoded), dtype='<i4')
+    decoded = np.cumsum(deltas.reshape(-1, 2), axis=0) / 1e6
+    np.testing.assert_allclose(decoded, coords, atol=1e-9)
+    with pytest.raises(ValueError):
+        delta_encode_positions(coords, 8)
+    # Each position fits at 7 decimals, but not the delta between them
+    with pytest.raises(ValueError):
+        delta_encode_positions([[-179, 0], [179, 0]], 7)
+    # Out of the int64 range too: would wrap around when cast
+    with pytest.raises(ValueError):
+        delta_encode_positions([[180, 0]], 17)
+    with pytest.raises(ValueError):
+        delta_encode_positions([[np.nan, 0]], 6)
+
+
+def test_delta_encoding_html():
+    plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    plt.plot([0, 1, 2], [0, 1, 0], 'rs')
+    html = mplleaflet.fig_to_html(encoding='delta')
+    assert 'decodeGeoJson(' in html
+    assert '"encoding": {"type": "delta", "scale": 1000000}' in html
+    with pytest.raises(ValueError):
+        plt.figure()
+        mplleaflet.fig_to_html(encoding='binary')
+
+
+def test_embed_links_offline():
+    plt.figure()
+    plt.plot([0, 1], [0, 1])
+    html = mplleaflet.fig_to_html(embed_links=True)
+    assert 'o.version="0.7.3"' in html
+    assert 'cdnjs' not in html
+
+
+def test_link_cache(tmpdir, monkeypatch):
+    monkeypatch.setenv('MPLLEAFLET_CACHE_DIR', str(tmpdir))
+    source = tmpdir.join('source.js')
+    source.write('var x = 1;')
+    url = 'file://' + str(source)
+
+    link = JavascriptLink(url)
+    assert link.render(embedded=True) == '<script>var x = 1;</script>'
+    assert os.path.exists(link.cache_path())
+
+    # A new process finds it in the cache without the source
+    source.remove()
+    assert JavascriptLink(url).get_code() == b'var x = 1;'
+
+    # A corrupted cache entry is not used
+    with open(link.cache_path(), 'w') as f:
+        f.write('garbage')
+    with pytest.raises(IOError):
+        JavascriptLink(url).get_code()
+
+
+def _make_line_figure():
+    fig = plt.figure()
+    plt.plot([0, 1, 2], [0, 1, 0], 'b-')
+    return fig
+
+
+def _make_bad_figure():
+    plt.figure()
+    raise RuntimeError('no figure')
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_save_html_batch(tmpdir, processes):
+    paths = [str(tmpdir.join('map{}.html'.format(i))) for i in range(3)]
+    done = []
+    plt.figure()
+    fignums = plt.get_fignums()
+    results = mplleaflet.save_html_batch(
+        [_make_line_figure, _make_bad_figure, _make_line_figure], paths,
+        processes=processes, callback=done.append)
+    # The figures made by the callables are closed, the caller's aren't
+    assert plt.get_fignums() == fignums
+    assert [r.index for r in results] == [0, 1, 2]
+    assert len(done) == 3
+    assert results[0].error is None and results[2].error is None
+    assert 'no figure' in results[1].error
+    with open(paths[2]) as f:
+        assert 'LineString' in f.read()
+
+
+def test_cli_geojson_without_pyplot(tmpdir):
+    src = os.path.join(os.path.dirname(__file__), os.pardir, 'examples',
+                       'data', 'track.geojson')
+    code = ('import sys; from mplleaflet.cli import main; '
+            'rc = main(sys.argv[1:]); '
+            'assert "matplotlib.pyplot" not in sys.modules; sys.exit(rc)')
+    subprocess.check_call([sys.executable, '-c', code, '-o', str(tmpdir),
+                           '--precision', '5', src])
+    with open(str(tmpdir.join('track.html'))) as f:
+        assert '"type": "Point"' in f.read()
+
+
+def test_cli_pickle(tmpdir):
+    fig = _make_line_figure()
+    src = str(tmpdir.join('line.pkl'))
+    with open(src, 'wb') as f:
+        pickle.dump(fig, f)
+    plt.close(fig)
+    assert cli.main([src, '--tiles', 'cartodb_positron']) == 0
+    with open(str(tmpdir.join('line.html'))) as f:
+        html = f.read()
+    assert 'LineString' in html
+    assert 'basemaps.cartocdn.com' in html
+    assert cli.main([str(tmpdir.join('missing.pkl'))]) == 1
+
+    # Inputs of the same name would overwrite each other's map
+    other = tmpdir.mkdir('other').join('line.pkl')
+    with open(str(other), 'wb') as f:
+        pickle.dump(fig, f)
+    out = tmpdir.mkdir('out')
+    assert cli.main([src, str(other), '-o', str(out)]) == 2
+    assert not out.listdir()
+
+
+def test_cli_script_with_show(tmpdir):
+    # Scripts run in this process with -j 1: show() must neither block nor
+    # open a browser, and the figures already open are left alone
+    plt.figure()
+    fignums = plt.get_fignums()
+    shown = str(tmpdir.join('shown.html'))
+    src = tmpdir.join('script.py')
+    src.write('import matplotlib.pyplot as plt\n'
+              'import mplleaflet\n'
+              'plt.figure()\n'
+              'plt.plot([0, 1], [0, 1])\n'
+              'plt.show()\n'
+              'mplleaflet.show(plt.figure(), path={!r})\n'.format(shown))
+    assert cli.main([str(src), '-j', '1']) == 0
+    assert plt.get_fignums() == fignums
+    assert os.path.exists(shown)
+    with open(str(tmpdir.join('script.html'))) as f:
+        assert 'LineString' in f.read()
+
+
+def _imported_modules(statement):
+    """ Return the modules imported by statement, using -X importtime """
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.STDOUT, universal_newlines=True)
+    return [line.split('|')[-1].strip() for line in output.splitlines()
+            if line.startswith('import time:')]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='needs -X importtime')
+def test_import_is_lazy():
+    modules = _imported_modules('import mplleaflet')
+    assert 'mplleaflet' in modules
+    heavy = ['matplotlib', 'matplotlib.pyplot', 'numpy', 'jinja2', 'IPython',
+             'pyproj', 'multiprocessing', 'http.server', 'socketserver']
+    assert [m for m in heavy if m in modules] == []
+
+
+def test_render_cache(tmpdir):
+    from mplleaflet.cache import RenderCache
+
+    cache = RenderCache(directory=str(tmpdir.join('cache')))
+    fig = plt.figure()
+    line, = plt.plot([0, 1, 2], [0, 1, 0])
+    html = mplleaflet.fig_to_html(fig, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert mplleaflet.fig_to_html(fig, cache=cache) == html
+    assert cache.hits == 1
+
+    # Same content in a new cache on the same directory gives the same map
+    disk = RenderCache(directory=str(tmpdir.join('cache')))
+    assert mplleaflet.fig_to_html(fig, cache=disk) == html
+    assert disk.hits == 1
+
+    # Changing the data or the arguments misses
+    line.set_ydata([0, 2, 0])
+    changed = mplleaflet.fig_to_html(fig, cache=cache)
+    assert changed != html
+    mplleaflet.fig_to_html(fig, cache=cache, float_precision=3)
+    assert cache.misses == 3
+
+    geojson = mplleaflet.fig_to_geojson(fig, cache=cache)
+    assert geojson == mplleaflet.fig_to_geojson(fig)
+    assert mplleaflet.fig_to_geojson(fig, cache=cache) == geojson
+    plt.close(fig)
+
+    # A colormapped scatter gets its colors when first drawn, which must
+    # not change its key
+    cache = RenderCache()
+    fig, ax = plt.subplots()
+    collection = ax.scatter([0, 1, 2], [0, 1, 2], c=[1, 2, 3])
+    html = mplleaflet.fig_to_html(fig, cache=cache)
+    assert mplleaflet.fig_to_html(fig, cache=cache) == html
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    collection.set_array(np.array([3, 2, 1]))
+    assert mplleaflet.fig_to_html(fig, cache=cache) != html
+    plt.close(fig)
+
+
+def test_render_cache_eviction(tmpdir):
+    from mplleaflet.cache import RenderCache
+
+    cache = RenderCache(maxsize=10, directory=str(tmpdir),
+                        disk_maxsize=10)
+    cache.set('a', 'x' * 4)
+    cache.set('b', 'y' * 4)
+    assert cache.get('a') == 'x' * 4
+    cache.set('c', 'z' * 4)
+    # 'b' was the least recently used
+    assert len(cache) == 2
+    assert 'b' not in cache._items
+    # The disk is trimmed to 3/4 of its limit, oldest files first
+    assert os.listdir(str(tmpdir)) == ['c']
+    assert cache._disk_size == 4
+    cache.set('big', 'w' * 11)
+    assert cache.get('big') is None
+
+    # Files removed by another process are only noticed when the directory
+    # is listed again
+    os.remove(str(tmpdir.join('c')))
+    cache.set('d', 'v' * 4)
+    cache.set('e', 'u' * 4)
+    assert os.listdir(str(tmpdir)) == ['e']
+    assert cache._disk_size == 4
+    cache.clear()
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_map_session():
+    fig, ax = plt.subplots()
+    line, = ax.plot([0, 1, 2], [0, 1, 0])
+    other, = ax.plot([0, 1], [1, 1], 'o')
+    session = mplleaflet.MapSession(fig)
+    html = session.html()
+    assert 'applyDiff' in html
+    assert session.mapid in html
+    assert 'var allowedOrigin = null || window.origin;' in html
+    html = session.html(origin='https://example.com')
+    assert 'var allowedOrigin = "https://example.com" ||' in html
+
+    assert session.update() == {'update': [], 'remove': [], 'icons': []}
+
+    line.set_ydata([0, 2, 0])
+    diff = session.update()
+    assert len(diff['update']) == 1
+    key, fc = diff['update'][0]
+    assert fc['features'][0]['geometry']['coordinates'] == [
+        [0, 0], [1, 2], [2, 0]]
+    assert diff['remove'] == [] and diff['icons'] == []
+
+    other.remove()
+    diff = session.update()
+    assert diff['update'] == []
+    assert len(diff['remove']) == 1 and diff['remove'][0] != key
+
+    ax.scatter([3, 4], [3, 4], marker='^')
+    diff = session.update()
+    assert len(diff['update']) == 1
+    assert len(diff['icons']) == 1
+    plt.close(fig)
+
+    # Drawing a colormapped scatter doesn't make it look changed
+    fig, ax = plt.subplots()
+    ax.scatter([0, 1, 2], [0, 1, 2], c=[1, 2, 3])
+    session = mplleaflet.MapSession(fig)
+    session.html()
+    assert session.update() == {'update': [], 'remove': [], 'icons': []}
+    plt.close(fig)
+
+
+def test_map_widget():
+    pytest.importorskip('anywidget')
+
+    fig, ax = plt.subplots()
+    line, = ax.plot([0, 1, 2], [0, 1, 0])
+    widget = mplleaflet.display(fig, backend='widget', float_precision=3)
+    assert json.loads(widget.geojson.decode('utf8')) == \
+        mplleaflet.fig_to_geojson(fig)
+    assert widget.height == int(60. * fig.get_figheight())
+    assert not widget._leaflet_js_code
+
+    line.set_ydata([0, 2, 0])
+    widget.update(fig)
+    geojson = json.loads(widget.geojson.decode('utf8'))
+    assert geojson['features'][0]['geometry']['coordinates'][1] == [1, 2]
+
+    # display() closed the figure, but update() still redraws it rather
+    # than a new gcf()
+    assert not plt.fignum_exists(fig.number)
+    fignums = plt.get_fignums()
+    line.set_ydata([0, 3, 0])
+    widget.update()
+    geojson = json.loads(widget.geojson.decode('utf8'))
+    assert geojson['features'][0]['geometry']['coordinates'][1] == [1, 3]
+    assert plt.get_fignums() == fignums
+
+
+def test_empty_path():
+    renderer = LeafletRenderer()
+    style = {'edgecolor': '#000000', 'edgewidth': 1, 'alpha': 1,
+             'facecolor': 'none', 'dasharray': 'none'}
+    renderer.draw_path(np.empty((0, 2)), 'data', [], style)
+    assert renderer.geojson()['features'] == []
+
+
+def test_contour_and_quiver():
+    X, Y = np.meshgrid(np.arange(10.), np.arange(10.))
+    fig, ax = plt.subplots()
+    ax.contour(X, Y, X * Y, 5)
+    geojson = mplleaflet.fig_to_geojson(fig)
+    assert len(geojson['features']) > 0
+    assert set(f['geometry']['type'] for f in geojson['features']) <= \
+        set(['LineString', 'MultiLineString'])
+    plt.close(fig)
+
+    fig, ax = plt.subplots()
+    ax.quiver([0, 1], [0, 1], [1, 1], [1, 0])
+    geojson = mplleaflet.fig_to_geojson(fig)
+    assert len(geojson['features']) == 2
+    assert len(geojson['icons']) == 2
+    plt.close(fig)
+
+
+def test_profile():
+    fig, ax = plt.subplots()
+    line, = ax.plot([0, 1, 2], [0, 1, 0], label='track')
+    ax.scatter([0, 1], [1, 0])
+    profile = mplleaflet.Profile()
+    html = mplleaflet.fig_to_html(fig, epsg=4326, profile=profile)
+
+    stages = profile.to_dict()['stages']
+    assert set(stages) == set(['export', 'reproject', 'encode', 'template'])
+    assert stages['export']['features'] == 2
+    assert stages['export']['vertices'] == 5
+    assert (stages['encode']['bytes'] + stages['template']['bytes'] ==
+            len(html.encode('utf8')))
+    assert profile.seconds >= stages['export']['seconds'] > 0
+    artists = profile.to_dict()['artists']
+    assert [(a['type'], a['features'], a['vertices']) for a in artists] == [
+        ('Line2D', 1, 3), ('PathCollection', 1, 2)]
+    assert artists[0]['label'] == 'track'
+    assert 'total' in profile.report()
+
+    reports = []
+    mplleaflet.fig_to_geojson(fig, profile=reports.append)
+    assert len(reports) == 1
+    assert reports[0]['stages']['export']['features'] == 2
+    plt.close(fig)
+
+
+def test_feature_bounds():
+    from mplleaflet import tiling
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [0, 3, 1])
+    ax.scatter([5, 6], [-1, 2])
+    ax.add_patch(plt.Polygon([[10, 10], [11, 10], [11, 12]]))
+    renderer = LeafletRenderer(epsg=4326)
+    Exporter(renderer).run(fig)
+    geojson = renderer.geojson()
+    np.testing.assert_allclose(renderer.feature_bounds(),
+                               tiling.feature_bounds(geojson['features']))
+
+    html = mplleaflet.fig_to_html(fig)
+    assert 'map.fitBounds([[-1.0, 0.0], [12.0, 11.0]])' in html
+    assert 'cull()' not in html
+    assert 'cull()' in mplleaflet.fig_to_html(fig, cull=True)
+    plt.close(fig)
+
+
+def test_grid_index():
+    from mplleaflet.tiling import grid_index
+
+    bounds = np.array([[0, 0, 1, 1], [2, 2, 3, 3], [np.nan] * 4,
+                       [0, 0, 3, 3]])
+    index = grid_index(bounds, size=2)
+    assert index['bounds'] == [0, 0, 3, 3]
+    cells = [index['ids'][index['cells'][c]:index['cells'][c + 1]]
+             for c in range(4)]
+    assert cells == [[0, 3], [3], [3], [1, 3]]
+    assert index['boxes'][4:8] == [2, 2, 3, 3]
+    assert grid_index(np.full((1, 4), np.nan)) is None
+
+
+def test_imshow_overlay():
+    from mplleaflet.raster import decode_png
+
+    data = np.zeros((600, 300))
+    data[0, 0] = 1
+    fig, ax = plt.subplots()
+    ax.imshow(data, extent=[10, 13, 0, 6], cmap='gray')
+    geojson = mplleaflet.fig_to_geojson(fig)
+    image, = geojson['images']
+    assert image['bounds'] == [[0, 10], [6, 13]]
+    assert (image['width'], image['height']) == (300, 600)
+    assert len(image['tiles']) == 6
+    # data[0, 0] is drawn at the top left with the default origin
+    tile = image['tiles'][0]
+    assert tile['bounds'] == [[3.44, 10], [6, 12.56]]
+    rgba = decode_png(tile['url'].split(',')[1])
+    assert rgba.shape == (256, 256, 4)
+    assert rgba[0, 0, 0] > rgba[-1, 0, 0]
+
+    html = mplleaflet.fig_to_html(fig)
+    assert 'drawImages();' in html
+    assert 'map.fitBounds([[0.0, 10.0], [6.0, 13.0]])' in html
+    plt.close(fig)
+
+
+def test_image_overlay_max_size():
+    from mplleaflet.raster import image_overlay
+
+    rgba = np.zeros((1000, 300, 4), dtype=np.uint8)
+    image = image_overlay(rgba, (0, 3, 0, 10), max_size=256)
+    # Halved until it fits, so only one resolution is inlined
+    assert (image['width'], image['height']) == (75, 250)
+    assert len(image['tiles']) == 1
+    assert image['tiles'][0]['bounds'] == [[0, 0], [10, 3]]
+
+
+def test_pcolormesh_overlay():
+    fig, ax = plt.subplots()
+    ax.pcolormesh(np.arange(5.), np.arange(4.), np.arange(12.).reshape(3, 4))
+    geojson = mplleaflet.fig_to_geojson(fig)
+    assert geojson['features'] == []
+    image, = geojson['images']
+    assert image['bounds'] == [[0, 0], [3, 4]]
+    assert len(image['tiles']) == 1
+    plt.close(fig)
+
+    # The alpha is applied once, in the pixels
+    from mplleaflet.raster import decode_png
+    fig, ax = plt.subplots()
+    ax.pcolormesh(np.arange(3.), np.arange(3.), np.ones((2, 2)), alpha=0.5)
+    image, = mplleaflet.fig_to_geojson(fig)['images']
+    rgba = decode_png(image['tiles'][0]['url'].split(',')[1])
+    alpha = image['opacity'] * rgba[..., 3] / 255.
+    np.testing.assert_allclose(alpha, 0.5, atol=0.01)
+    plt.close(fig)
+
+    # Irregular meshes are still drawn cell by cell
+    fig, ax = plt.subplots()
+    ax.pcolormesh([0, 1, 3], [0, 1], [[1, 2]])
+    geojson = mplleaflet.fig_to_geojson(fig)
+    assert len(geojson['features']) == 2
+    assert 'images' not in geojson
+    plt.close(fig)
+
+
+def test_map_server():
+    import gzip
+    from six.moves.urllib.error import HTTPError
+    from six.moves.urllib.request import Request, urlopen
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    server = mplleaflet.MapServer()
+    try:
+        url = server.add(fig, name='lines')
+        server.add(fig, name='other', encoding='delta')
+        server.start()
+
+        page = urlopen(url).read().decode('utf8')
+        assert "request.open('GET', 'data.json')" in page
+
+        request = Request(url + 'data.json',
+                          headers={'Accept-Encoding': 'gzip'})
+        response = urlopen(request)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        geojson = json.loads(gzip.decompress(response.read()).decode('utf8'))
+        assert geojson == mplleaflet.fig_to_geojson(fig)
+
+        etag = response.headers['ETag']
+        assert etag.endswith('-gzip"')
+        with pytest.raises(HTTPError) as e:
+            urlopen(Request(url + 'data.json',
+                            headers={'If-None-Match': etag,
+                                     'Accept-Encoding': 'gzip'}))
+        assert e.value.code == 304
+        # The uncompressed body is another representation, with its own ETag
+        response = urlopen(Request(url + 'data.json',
+                                   headers={'If-None-Match': etag}))
+        assert response.headers['ETag'] == etag.replace('-gzip', '')
+        assert response.headers['Vary'] == 'Accept-Encoding'
+
+        index = urlopen(server.url).read().decode('utf8')
+        assert 'lines/' in index and 'other/' in index
+        with pytest.raises(HTTPError) as e:
+            urlopen(server.url + 'missing/')
+        assert e.value.code == 404
+    finally:
+        server.stop()
+        plt.close(fig)
+
+
+def test_geo_to_html():
+    class Point(object):
+        __geo_interface__ = {'type': 'Point', 'coordinates': [1., 2.]}
+
+    line = np.array([[0., 0.], [1., 1.], [2., 0.]])
+    geojson = mplleaflet.to_geojson([line, Point()], color=(1, 0, 0),
+                                    weight=3)
+    lines, point = geojson['features']
+    assert lines['geometry'] == {'type': 'LineString',
+                                 'coordinates': line.tolist()}
+    assert lines['properties'] == {'color': '#FF0000', 'weight': 3}
+    assert point['geometry'] == Point.__geo_interface__
+
+    polygon, = mplleaflet.to_geojson(line, fill_color='blue')['features']
+    assert polygon['geometry']['type'] == 'Polygon'
+    assert polygon['geometry']['coordinates'][0][-1] == [0., 0.]
+
+    # Icons of exported figures are renumbered when collections are merged
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1], 'o')
+    exported = mplleaflet.fig_to_geojson(fig)
+    plt.close(fig)
+    merged = mplleaflet.to_geojson([exported, exported])
+    assert len(merged['icons']) == 2
+    assert [f['properties']['icon'] for f in merged['features']] == [0, 1]
+
+    html = mplleaflet.geo_to_html(exported, mapid='m')
+    assert html == ''.join(mplleaflet._display._iter_geojson_html(
+        exported, mapid='m'))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='needs -X importtime')
+def test_geo_to_html_escapes_script():
+    name = '</script><script>alert(1)</script>'
+    feature = {'type': 'Feature',
+               'geometry': {'type': 'Point', 'coordinates': [1., 2.]},
+               'properties': {'name': name}}
+    html = mplleaflet.geo_to_html(feature)
+    assert name not in html
+    assert '<\\/script><script>alert(1)<\\/script>' in html
+    # Only the script tags of the page itself are closed
+    feature['properties'] = {}
+    assert html.count('</script>') == \
+        mplleaflet.geo_to_html(feature).count('</script>')
+
+
+def test_geo_to_html_skips_matplotlib():
+    modules = _imported_modules(
+        'import numpy, mplleaflet; '
+        'mplleaflet.geo_to_html(numpy.array([[0., 0.], [1., 1.]]))')
+    assert 'jinja2' in modules
+    assert 'matplotlib' not in modules
+
+
+def test_layers_to_html():
+    import re
+
+    fig, (left, right) = plt.subplots(1, 2)
+    left.plot([0, 1], [0, 1], 'o-')
+    left.set_title('left')
+    right.plot([2, 3], [2, 3], 's')
+    html = mplleaflet.layers_to_html(
+        [left, ('right', right), np.array([[5., 5.], [6., 6.]])],
+        embed_links=True)
+    plt.close(fig)
+
+    # Leaflet is embedded once for all the layers
+    assert html.count('Leaflet, a JavaScript library') == 1
+    layers = re.findall(r'<script type="application/json" id="[^"]+">'
+                        r'(.*?)</script>', html)
+    layers = [json.loads(layer) for layer in layers]
+    assert [len(fc['features']) for fc in layers] == [2, 1, 1]
+    assert layers[2]['features'][0]['geometry']['type'] == 'LineString'
+
+    # Each axes keeps its own marker, in the icons shared by the layers
+    assert layers[0]['features'][1]['properties'] == {'icon': 0}
+    assert layers[1]['features'][0]['properties'] == {'icon': 1}
+    assert '["left", "right", "Layer 3"]' in html
+    # The map fits the bounds of all the layers
+    assert 'map.fitBounds([[0.0, 0.0], [6.0, 6.0]])' in html
+
+    with pytest.raises(ValueError):
+        mplleaflet.layers_to_html([('a', layers[0]), ('a', layers[1])])
+
+
+def test_save_layers_html_layer_dir(tmpdir):
+    import re
+
+    lines = [np.array([[0., 0.], [1., i]]) for i in range(3)]
+    path = str(tmpdir.join('map.html'))
+    mplleaflet.save_layers_html(lines, path, layer_dir=str(tmpdir.join('l')),
+                                visible=['Layer 2'])
+    with open(path) as f:
+        html = f.read()
+    # Only the visible layer is in the page, the others are fetched
+    inlined = re.findall(r'<script type="application/json" id="[^"]+-(\d)">',
+                         html)
+    assert inlined == ['1']
+    assert 'var layerUrl = "l/";' in html
+    assert sorted(tmpdir.join('l').listdir()) == [tmpdir.join('l', '0.json'),
+                                                  tmpdir.join('l', '2.json')]
+    layer = json.loads(tmpdir.join('l', '2.json').read())
+    assert layer['features'][0]['geometry']['coordinates'] == [[0, 0],
+                                                               [1, 2]]
+
+
+def test_template_cache(tmpdir, monkeypatch):
+    from mplleaflet import _display
+
+    monkeypatch.setattr(_display, '_env', None)
+    monkeypatch.setattr(_display, '_templates', {})
+    monkeypatch.setenv('MPLLEAFLET_TEMPLATE_CACHE', str(tmpdir.join('jinja')))
+    template = _display.get_template('base.html')
+    assert _display.get_template('base.html') is template
+    assert tmpdir.join('jinja').listdir()
+
+
+def test_marker_svg():
+    from mplleaflet.leaflet_renderer import render_svg
+
+    svg = render_svg('M 0.0 1.0 Z', {'stroke': '#FF0000'}, 8.5, 8.,
+                     -4.25, -4.)
+    assert svg == ('<svg width="8px" height="8px" viewBox="-4.25 -4.0 8.5 '
+                   '8.0" xmlns="http://www.w3.org/2000/svg" version="1.1">  '
+                   '<path d="M 0.0 1.0 Z" stroke="#FF0000" /></svg>')
+
+
+def test_ipynb_template_waits_for_leaflet():
+    # Notebook outputs are added after the window's load event, so the map
+    # is drawn by polling for Leaflet rather than on load
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    html = mplleaflet.fig_to_html(fig, template='ipynb.html')
+    plt.close(fig)
+    assert "addEventListener('load'" not in html
+    assert 'setTimeout(draw, 50)' in html